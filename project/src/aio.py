@@ -0,0 +1,98 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor
+from itertools import islice
+
+from .book import Book, BookView
+from .concurrency import ThreadSafeLibrary
+
+
+class AsyncLibrary:
+    """
+    Асинхронный фасад над ThreadSafeLibrary для сервисов на asyncio.
+    Все вызовы библиотеки выполняются в пуле потоков, поэтому цикл событий
+    не блокируется ни поиском, ни перестроением индекса. Массовое добавление
+    идёт пакетами по chunk_size, одинаковые одновременные поиски объединяются
+    в один вызов, а большие результаты можно обходить через iterate.
+    """
+
+    def __init__(
+        self,
+        library: ThreadSafeLibrary | None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 1000,
+    ) -> None:
+        self.library = library if library is not None else ThreadSafeLibrary()
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def add_book(self, book: Book) -> None:
+        await self._write(self.library.add_book, book)
+
+    async def add_books(self, books: Iterable[Book]) -> None:
+        books = iter(books)
+        while chunk := list(islice(books, self.chunk_size)):
+            await self._write(self.library.add_books, chunk)
+
+    async def remove_book(self, book: Book) -> None:
+        await self._write(self.library.remove_book, book)
+
+    async def update_index(self, full: bool = False) -> None:
+        await self._write(self.library.update_index, full)
+
+    async def search_by_isbn(self, isbn: str) -> Book | None:
+        return await self._read("search_by_isbn", isbn)
+
+    async def search_by_author(self, author: str) -> BookView:
+        return await self._read("search_by_author", author)
+
+    async def search_by_year(self, year: int) -> BookView:
+        return await self._read("search_by_year", year)
+
+    async def search_by_year_range(self, start: int, end: int) -> BookView:
+        return await self._read("search_by_year_range", start, end)
+
+    async def search_by_title(self, title: str) -> BookView:
+        return await self._read("search_by_title", title)
+
+    async def search_by_genre(self, genre: str) -> BookView:
+        return await self._read("search_by_genre", genre)
+
+    async def iterate(self, name: str, *args) -> AsyncIterator[Book]:
+        """
+        Обходит результат поиска name(*args), отдавая управление циклу
+        событий после каждых chunk_size книг.
+        """
+        results = await self._read(name, *args)
+        if results is None:
+            return
+        if isinstance(results, Book):
+            results = (results,)
+        for position, book in enumerate(results, 1):
+            yield book
+            if position % self.chunk_size == 0:
+                await asyncio.sleep(0)
+
+    async def _read(self, name: str, *args):
+        key = (name, *args)
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, getattr(self.library, name), *args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._forget(key, future))
+        # shield: отмена одного ожидающего не отменяет поиск для остальных.
+        return await asyncio.shield(future)
+
+    async def _write(self, method, *args) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.executor, method, *args)
+        finally:
+            # Поиски, начатые до записи, не должны отвечать на новые запросы.
+            self._inflight.clear()
+
+    def _forget(self, key: tuple, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
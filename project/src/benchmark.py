@@ -0,0 +1,223 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence, Sized
+from dataclasses import asdict, dataclass
+from functools import partial
+
+from .book import Library
+from .simulation import create_random_books
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+@dataclass
+class BenchmarkResult:
+    """Замер одной операции на библиотеке заданного размера."""
+
+    size: int
+    operation: str
+    ops: int
+    seconds: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    peak_kib: float
+    books_per_call: int = 1
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def books_per_second(self) -> float:
+        return self.ops_per_second * self.books_per_call
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Процентиль q (0..100) по методу ближайшего ранга. values должны быть отсортированы."""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+
+def measure(
+    size: int,
+    operation: str,
+    calls: Sequence[Callable[[], object]],
+    memory: bool = True,
+    books_per_call: int = 1,
+) -> BenchmarkResult:
+    """
+    Выполняет calls по одному, замеряя время каждого вызова.
+    Пиковая память считается через tracemalloc, только если memory=True:
+    трассировка заметно замедляет вызовы, поэтому время с ней не смешивается.
+    Для пакетных операций books_per_call — число книг в одном вызове.
+    Результат вызова освобождается вне замера.
+    """
+    timings = []
+    clock = time.perf_counter_ns
+    if memory:
+        tracemalloc.start()
+    started = clock()
+    for call in calls:
+        before = clock()
+        result = call()
+        timings.append(clock() - before)
+        del result
+    seconds = (clock() - started) / 1e9
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    timings.sort()
+    return BenchmarkResult(
+        size,
+        operation,
+        len(timings),
+        seconds,
+        percentile(timings, 50) / 1000,
+        percentile(timings, 95) / 1000,
+        percentile(timings, 99) / 1000,
+        peak / 1024,
+        books_per_call,
+    )
+
+
+def count_matches(search: Callable[..., Sized], key: object) -> int:
+    """
+    Число книг, найденных search по key. Поиск по автору, году и жанру
+    возвращает ленивое представление, поэтому без len замер покрывал бы
+    только его создание, а не обход записей индекса.
+    """
+    return len(search(key))
+
+
+def run_size(
+    size: int,
+    ops: int = 1000,
+    seed: int = 0,
+    memory: bool = False,
+    repeat: int = 5,
+) -> list[BenchmarkResult]:
+    """
+    Строит библиотеку из size случайных книг и замеряет основные операции.
+    Пакетные операции (add_books, update_index_full) повторяются repeat раз,
+    а их скорость считается и в книгах в секунду.
+    """
+    books = list(create_random_books(size + ops, seed))
+    extra = books[size:]
+    del books[size:]
+    rng = random.Random(seed)
+    probes = rng.choices(books, k=ops)
+
+    def fill() -> Library:
+        filled = Library()
+        filled.add_books(books)
+        return filled
+
+    results = [measure(size, "add_books", [fill] * repeat, memory, size)]
+    library = fill()
+    add_calls: list[Callable[[], object]] = [partial(library.add_book, book) for book in extra]
+    results.append(measure(size, "add_book", add_calls, memory))
+    lookups: dict[str, list[Callable[[], object]]] = {
+        "search_by_isbn": [partial(library.search_by_isbn, book.isbn) for book in probes],
+        "search_by_isbn_miss": [partial(library.search_by_isbn, f"нет-{i}") for i in range(ops)],
+        "search_by_author": [partial(count_matches, library.search_by_author, book.author) for book in probes],
+        "search_by_year": [partial(count_matches, library.search_by_year, book.year) for book in probes],
+        "search_by_genre": [partial(count_matches, library.search_by_genre, book.genre) for book in probes],
+    }
+    for operation, calls in lookups.items():
+        results.append(measure(size, operation, calls, memory))
+    remove_calls: list[Callable[[], object]] = [partial(library.remove_book, book) for book in extra]
+    results.append(measure(size, "remove_book", remove_calls, memory))
+    rebuild_calls: list[Callable[[], object]] = [partial(library.update_index, full=True)] * repeat
+    results.append(measure(size, "update_index_full", rebuild_calls, memory, size))
+    return results
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    ops: int = 1000,
+    seed: int = 0,
+    memory: bool = False,
+    repeat: int = 5,
+) -> dict:
+    results = [result for size in sizes for result in run_size(size, ops, seed, memory, repeat)]
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "ops": ops,
+            "repeat": repeat,
+            "memory": memory,
+        },
+        "results": [
+            asdict(result) | {"ops_per_second": result.ops_per_second, "books_per_second": result.books_per_second}
+            for result in results
+        ],
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list[str]:
+    """
+    Сравнивает два прогона. Возвращает описания регрессий: операций,
+    у которых пропускная способность упала больше чем на threshold.
+    """
+    before = {(row["size"], row["operation"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = before.get((row["size"], row["operation"]))
+        if old is None or not old["ops_per_second"]:
+            continue
+        change = row["ops_per_second"] / old["ops_per_second"] - 1
+        if change < -threshold:
+            regressions.append(
+                f"{row['operation']} (n={row['size']}): "
+                f"{old['ops_per_second']:.0f} -> {row['ops_per_second']:.0f} оп/с ({change:+.0%})"
+            )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк операций библиотеки")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--ops", type=int, default=1000, help="число вызовов на операцию")
+    parser.add_argument("--repeat", type=int, default=5, help="число повторов пакетных операций")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="замерять пиковую память через tracemalloc")
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.ops, args.seed, args.memory, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    for row in report["results"]:
+        if row["books_per_call"] > 1:
+            rate = f"{row['books_per_second']:>12.0f} книг/с"
+        else:
+            rate = f"{row['ops_per_second']:>12.0f} оп/с  "
+        print(
+            f"{row['size']:>9} {row['operation']:<20} {rate} "
+            f"p50 {row['p50_us']:.1f} мкс p99 {row['p99_us']:.1f} мкс"
+        )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(json.load(file), report, args.threshold)
+        for line in regressions:
+            print(f"Регрессия: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
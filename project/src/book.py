@@ -1,4 +1,49 @@
+import gc
+import os
+import random
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from itertools import chain, islice, repeat
+from typing import TYPE_CHECKING, Any, cast
+
+from .query import QueryPlan, execute_query, plan_query
+from .search import PreparedKeys, TextIndex
+
+if TYPE_CHECKING:
+    from .store import BookStore
+    from .wal import WriteAheadLog
+
+
+def _intern(value: object) -> object:
+    return sys.intern(value) if type(value) is str else value
+
+
+# Поля книги, изменение которых отражается в индексах библиотеки.
+_FIELDS = ("title", "author", "year", "genre", "isbn")
+_INTERNED = frozenset(("title", "author", "genre"))
+
+
 class Book:
+    """
+    Книга. Хранится в __slots__ без __dict__, а название, автор
+    и жанр интернируются, чтобы одинаковые строки разделялись
+    между всеми экземплярами. Чтение полей — обычный доступ к слоту,
+    а присваивание полю книги, принадлежащей библиотеке, передаётся
+    библиотеке, которая обновляет хранилище и индексы.
+    """
+
+    __slots__ = ("title", "author", "year", "genre", "isbn", "_library")
+
+    title: str
+    author: str
+    year: int
+    genre: str
+    isbn: str
+    _library: "Library | None"
+
     def __init__(
         self,
         title: str,
@@ -8,40 +53,315 @@ class Book:
         isbn: str,
     ) -> None:
 
-        self.title = title
-        self.author = author
-        self.year = year
-        self.genre = genre
-        self.isbn = isbn
+        # Слоты заполняются напрямую, минуя __setattr__.
+        _set_title(self, _intern(title))
+        _set_author(self, _intern(author))
+        _set_year(self, year)
+        _set_genre(self, _intern(genre))
+        _set_isbn(self, isbn)
+        _set_library(self, None)
+    
+    def __setattr__(self, name: str, value: object) -> None:
+        if name in _INTERNED:
+            value = _intern(value)
+        library = self._library
+        if library is not None and name in _FIELDS:
+            library.set_book_field(self, name, value)
+        else:
+            object.__setattr__(self, name, value)
+    
+    def __reduce__(self):
+        return (Book, (self.title, self.author, self.year, self.genre, self.isbn))
+    
+    @classmethod
+    def from_columns(
+        cls,
+        titles: Iterable[str],
+        authors: Iterable[str],
+        years: Iterable[int],
+        genres: Iterable[str],
+        isbns: Iterable[str],
+    ) -> "list[Book]":
+        """
+        Создаёт книги по колонкам значений. Слоты заполняются по колонке
+        за раз, без вызова __init__ для каждой книги. Строки не интернируются:
+        колонки должны ссылаться на уже общие строки, например из таблиц снимка.
+        """
+        isbns = list(isbns)
+        books: list[Book] = list(map(object.__new__, repeat(cls, len(isbns))))
+        for setter, values in (
+            (_set_title, titles),
+            (_set_author, authors),
+            (_set_year, years),
+            (_set_genre, genres),
+            (_set_isbn, isbns),
+            (_set_library, repeat(None)),
+        ):
+            deque(map(setter, books, values), maxlen=0)
+        return books
+
+
+_set_title = Book.__dict__["title"].__set__
+_set_author = Book.__dict__["author"].__set__
+_set_year = Book.__dict__["year"].__set__
+_set_genre = Book.__dict__["genre"].__set__
+_set_isbn = Book.__dict__["isbn"].__set__
+_set_library = Book.__dict__["_library"].__set__
+
+
+class ChangeLog:
+    """
+    Журнал изменений коллекции, ещё не применённых к индексу.
+    Для каждого ISBN хранится только итоговое состояние: книга,
+    которая должна быть в индексе, или None, если её нужно удалить.
+    Для изменённых на месте книг запоминаются исходные значения полей.
+    При превышении limit журнал помечается переполненным и очищается.
+    Если задан owner, добавленные книги передаются ему во владение,
+    а удалённые освобождаются, в том числе после переполнения журнала.
+    """
+
+    def __init__(self, limit: int, owner: "Library | None" = None) -> None:
+        self.limit = limit
+        self.owner = owner
+        self.entries: dict[str, Book | None] = {}
+        self.mutations: dict[Book, dict[str, Any]] = {}
+        self.overflowed = False
+        self._paused = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries) + len(self.mutations)
+    
+    def record(self, book: Book, present: bool) -> None:
+        if self._paused:
+            return
+        if self.owner is not None:
+            if present:
+                object.__setattr__(book, "_library", self.owner)
+            elif book._library is self.owner:
+                object.__setattr__(book, "_library", None)
+        if self.overflowed:
+            return
+        self.entries[book.isbn] = book if present else None
+        self._check_limit()
+    
+    def record_mutation(self, book: Book, field: str, old_value: Any) -> None:
+        if self._paused or self.overflowed:
+            return
+        self.mutations.setdefault(book, {}).setdefault(field, old_value)
+        self._check_limit()
+    
+    def apply_to(self, index: "IndexDict") -> None:
+        """Применяет записанные изменения к индексу. Повторное применение безопасно."""
+        for book, old_values in self.mutations.items():
+            isbn = old_values.get("isbn", book.isbn)
+            if index.isbn_index.get(isbn) is not book:
+                continue
+            for field, old_value in old_values.items():
+                index.move(book, field, old_value)
+        for isbn, entry in self.entries.items():
+            current = index.isbn_index.get(isbn)
+            if current is entry:
+                continue
+            if current is not None:
+                index.remove(current)
+            if entry is not None:
+                index.add(entry)
+    
+    def clear(self) -> None:
+        self.entries.clear()
+        self.mutations.clear()
+        self.overflowed = False
+    
+    def paused(self) -> "ChangeLog":
+        """
+        Не записывать изменения, которые вызывающий сам применяет к индексу:
+        with log.paused(): ... Контекст реализован самим журналом, без
+        генератора, потому что открывается на каждое add_book.
+        """
+        return self
+    
+    def __enter__(self) -> None:
+        self._paused += 1
+    
+    def __exit__(self, *exc_info: object) -> None:
+        self._paused -= 1
+    
+    def _check_limit(self) -> None:
+        if len(self) > self.limit:
+            self.entries.clear()
+            self.mutations.clear()
+            self.overflowed = True
 
 
 class BookCollection:
+    """
+    Коллекция книг с сохранением порядка добавления.
+    Удаление помечает слот пустым (O(1)), а пустые слоты
+    вычищаются пакетно, когда их становится больше половины.
+    Чтение по индексу коллекцию не уплотняет: при пустых слотах
+    оно стоит O(n), а для случайной книги есть random_book() за O(1).
+    """
+
     def __init__(self) -> None:
-        self.books: list[Book] = []
+        self._slots: list[Book | None] = []
+        self._positions: dict[Book, int] = {}
+        self.change_log: ChangeLog | None = None
+    
+    @property
+    def books(self) -> list[Book]:
+        return list(self)
     
     def __getitem__(self, key: int | slice) -> Book | list[Book]:
-        return self.books[key]
+        if len(self._slots) == len(self._positions):
+            # Пустых слотов нет, поэтому None здесь не встречается.
+            return cast("Book | list[Book]", self._slots[key])
+        if isinstance(key, slice):
+            return list(self)[key]
+        if key < 0:
+            key += len(self)
+        if key >= 0:
+            for book in islice(self, key, None):
+                return book
+        raise IndexError("индекс вне диапазона коллекции")
     
     def __iter__(self):
-        return iter(self.books)
+        return (book for book in self._slots if book is not None)
+    
+    def random_book(self, randrange: Callable[[int], int] = random.randrange) -> Book:
+        """
+        Возвращает случайную книгу: выбирает случайный слот и повторяет
+        выбор, если слот пуст. Пустых слотов не больше половины, поэтому
+        в среднем хватает двух попыток. randrange(n) задаёт распределение
+        номера слота, по умолчанию равномерное.
+        """
+        if not self._positions:
+            raise IndexError("коллекция пуста")
+        while True:
+            book = self._slots[randrange(len(self._slots))]
+            if book is not None:
+                return book
     
     def __len__(self) -> int:
-        return len(self.books)
+        return len(self._positions)
+    
+    def __contains__(self, book: object) -> bool:
+        return book in self._positions
+    
+    def new_index(self) -> "IndexDict":
+        """Пустой индекс, который Library строит поверх этой коллекции."""
+        return IndexDict()
+    
+    def update(self, book: Book, field: str, value: object) -> None:
+        """Коллекция хранит сами объекты книг, поэтому при изменении поля обновлять нечего."""
     
     def add(self, book: Book) -> None:
-        self.books.append(book)
+        if book in self._positions:
+            raise ValueError(f"Книга с ISBN {book.isbn} уже есть в коллекции")
+        self._positions[book] = len(self._slots)
+        self._slots.append(book)
+        if self.change_log is not None:
+            self.change_log.record(book, True)
+    
+    def extend(self, books: list[Book]) -> None:
+        start = len(self._slots)
+        positions = dict(zip(books, range(start, start + len(books))))
+        if len(positions) != len(books) or not self._positions.keys().isdisjoint(positions):
+            raise ValueError("Часть книг уже есть в коллекции")
+        self._slots.extend(books)
+        self._positions.update(positions)
+        if self.change_log is not None:
+            for book in books:
+                self.change_log.record(book, True)
     
     def remove(self, book: Book) -> None:
-        self.books.remove(book)
+        position = self._positions.pop(book, None)
+        if position is None:
+            raise ValueError(f"Книга с ISBN {book.isbn} не найдена")
+        self._slots[position] = None
+        if len(self._slots) > 2 * len(self._positions):
+            self._compact()
+        if self.change_log is not None:
+            self.change_log.record(book, False)
+    
+    def _compact(self) -> None:
+        books = [book for book in self._slots if book is not None]
+        self._positions = {book: i for i, book in enumerate(books)}
+        self._slots = cast("list[Book | None]", books)
+
+
+class BookView:
+    """
+    Представление результата поиска только для чтения поверх записей индекса
+    без копирования. len() стоит O(число частей), срез — O(start + размер),
+    а materialize() создаёт независимую BookCollection.
+    
+    Представление живое: при каждом обращении оно заново находит записи
+    индекса по условиям поиска (функция lookup), поэтому видит книги,
+    добавленные и удалённые после поиска, даже если запись по ключу
+    исчезла и появилась снова. Обход копирует каждую запись перед тем,
+    как пройти её, поэтому в цикле по результату можно изменять
+    библиотеку. Представление с готовыми частями parts не меняется.
+    """
+
+    def __init__(
+        self,
+        parts: Iterable[Collection[Book]] = (),
+        lookup: Callable[[], Iterable[Collection[Book]]] | None = None,
+    ) -> None:
+        self._parts = list(parts)
+        self._lookup = lookup
+    
+    def __len__(self) -> int:
+        return sum(map(len, self._current()))
+    
+    def __iter__(self) -> Iterator[Book]:
+        for part in self._current():
+            yield from tuple(part)
+    
+    def __contains__(self, book: object) -> bool:
+        return any(book in part for part in self._current())
+    
+    def __getitem__(self, key: int | slice) -> Book | list[Book]:
+        books = chain.from_iterable(self._current())
+        if isinstance(key, slice):
+            start, stop = key.start or 0, key.stop
+            if key.step is None and start >= 0 and (stop is None or stop >= 0):
+                return list(islice(books, start, stop))
+            return list(books)[key]
+        if key < 0:
+            key += len(self)
+        if key >= 0:
+            for book in islice(books, key, None):
+                return book
+        raise IndexError("индекс вне диапазона результата")
+    
+    def materialize(self) -> BookCollection:
+        result = BookCollection()
+        result.extend(list(chain.from_iterable(self._current())))
+        return result
+    
+    def _current(self) -> Iterable[Collection[Book]]:
+        return self._parts if self._lookup is None else self._lookup()
 
 
 class IndexDict:
+    """
+    Индексы книг. Книги по ключу хранятся как упорядоченные
+    словари dict[Book, None]: порядок добавления сохраняется,
+    а удаление выполняется за O(1).
+    """
+
     def __init__(self) -> None:
         self.isbn_index: dict[str, Book] = {}
-        self.author_index: dict[str, list[Book]] = {}
-        self.year_index: dict[int, list[Book]] = {}
+        self.author_index: dict[str, dict[Book, None]] = {}
+        self.year_index: dict[int, dict[Book, None]] = {}
+        self.title_index: dict[str, dict[Book, None]] = {}
+        self.genre_index: dict[str, dict[Book, None]] = {}
+        self.sorted_years: list[int] = []
+        self.title_search = TextIndex()
+        self.author_search = TextIndex()
     
-    def __getitem__(self, key: str | int) -> Book | list[Book]:
+    def __getitem__(self, key: str | int) -> Book | dict[Book, None]:
         if isinstance(key, str):
             if key in self.isbn_index:
                 return self.isbn_index[key]
@@ -60,44 +380,300 @@ class IndexDict:
     
     def add(self, book: Book) -> None:
         self.isbn_index[book.isbn] = book
-        
-        if book.author not in self.author_index:
-            self.author_index[book.author] = []
-        self.author_index[book.author].append(book)
-        
-        if book.year not in self.year_index:
-            self.year_index[book.year] = []
-        self.year_index[book.year].append(book)
+        if _add_posting(self.author_index, book.author, book):
+            self.author_search.add(book.author)
+        if _add_posting(self.year_index, book.year, book):
+            insort(self.sorted_years, book.year)
+        if _add_posting(self.title_index, book.title, book):
+            self.title_search.add(book.title)
+        _add_posting(self.genre_index, book.genre, book)
     
     def remove(self, book: Book) -> None:
-        if book.isbn not in self.isbn_index:
+        indexed = self.isbn_index.get(book.isbn)
+        if indexed is None:
             raise KeyError(f"Книга с ISBN {book.isbn} не найдена")
         
-        del self.isbn_index[book.isbn]
-        
-        if book.author in self.author_index:
-            self.author_index[book.author].remove(book)
-            if not self.author_index[book.author]:
-                del self.author_index[book.author]
-        
-        if book.year in self.year_index:
-            self.year_index[book.year].remove(book)
-            if not self.year_index[book.year]:
-                del self.year_index[book.year]
+        # Под тем же ISBN может быть проиндексирована другая книга:
+        # её запись в isbn_index остаётся.
+        if indexed is book:
+            del self.isbn_index[book.isbn]
+        if _remove_posting(self.author_index, book.author, book):
+            self.author_search.remove(book.author)
+        if _remove_posting(self.year_index, book.year, book):
+            del self.sorted_years[bisect_left(self.sorted_years, book.year)]
+        if _remove_posting(self.title_index, book.title, book):
+            self.title_search.remove(book.title)
+        _remove_posting(self.genre_index, book.genre, book)
+    
+    def move(self, book: Book, field: str, old_value: Any) -> None:
+        """Переносит книгу из записи со старым значением поля в запись с текущим."""
+        if field == "isbn":
+            if self.isbn_index.get(old_value) is book:
+                del self.isbn_index[old_value]
+            self.isbn_index[book.isbn] = book
+            return
+        index = getattr(self, f"{field}_index")
+        new_value = getattr(book, field)
+        removed = _remove_posting(index, old_value, book)
+        added = _add_posting(index, new_value, book)
+        if field == "year":
+            if removed:
+                del self.sorted_years[bisect_left(self.sorted_years, old_value)]
+            if added:
+                insort(self.sorted_years, new_value)
+        elif field in ("title", "author"):
+            search = getattr(self, f"{field}_search")
+            if removed:
+                search.remove(old_value)
+            if added:
+                search.add(new_value)
+    
+    def add_many(self, books: Iterable[Book]) -> None:
+        """
+        Добавляет книги одним проходом: сначала группирует их по ключам,
+        затем присваивает группы индексам целиком.
+        """
+        by_author: dict[str, list[Book]] = {}
+        by_year: dict[int, list[Book]] = {}
+        by_title: dict[str, list[Book]] = {}
+        by_genre: dict[str, list[Book]] = {}
+        for book in books:
+            self.isbn_index[book.isbn] = book
+            by_author.setdefault(book.author, []).append(book)
+            by_year.setdefault(book.year, []).append(book)
+            by_title.setdefault(book.title, []).append(book)
+            by_genre.setdefault(book.genre, []).append(book)
+        self.merge_groups(by_author, by_year, by_title, by_genre)
+    
+    def merge_groups(
+        self,
+        by_author: Mapping[str, Iterable[Book]],
+        by_year: Mapping[int, Iterable[Book]],
+        by_title: Mapping[str, Iterable[Book]],
+        by_genre: Mapping[str, Iterable[Book]],
+        prepared_titles: PreparedKeys | None = None,
+        prepared_authors: PreparedKeys | None = None,
+    ) -> None:
+        """
+        Присоединяет заранее сгруппированные книги к индексам. ISBN не затрагивается.
+        Названия и авторы, уже разобранные через TextIndex.prepare, передаются
+        в prepared_titles и prepared_authors.
+        """
+        years_before = len(self.year_index)
+        if prepared_titles is None:
+            self.title_search.add_many(title for title in by_title if title not in self.title_index)
+        else:
+            self.title_search.add_prepared(prepared_titles)
+        if prepared_authors is None:
+            self.author_search.add_many(author for author in by_author if author not in self.author_index)
+        else:
+            self.author_search.add_prepared(prepared_authors)
+        _merge_postings(self.author_index, by_author)
+        _merge_postings(self.year_index, by_year)
+        _merge_postings(self.title_index, by_title)
+        _merge_postings(self.genre_index, by_genre)
+        if len(self.year_index) != years_before:
+            self.sorted_years = sorted(self.year_index)
+    
+    def min_year(self) -> int | None:
+        return self.sorted_years[0] if self.sorted_years else None
+    
+    def max_year(self) -> int | None:
+        return self.sorted_years[-1] if self.sorted_years else None
+    
+    def years_in_range(self, start: int, end: int) -> list[int]:
+        """Возвращает отсортированные годы из диапазона [start, end]."""
+        low = bisect_left(self.sorted_years, start)
+        high = bisect_right(self.sorted_years, end)
+        return self.sorted_years[low:high]
+    
+    def year_postings(self, start: int, end: int) -> list[Collection[Book]]:
+        """Записи индекса по годам из [start, end] в порядке возрастания года."""
+        return [self.year_index[year] for year in self.years_in_range(start, end)]
+    
+    def books_in_range(self, start: int, end: int) -> Iterator[Book]:
+        """Книги с годом издания в [start, end] в порядке возрастания года."""
+        for year in self.years_in_range(start, end):
+            yield from self.year_index[year]
+    
+    def newest(self, count: int) -> list[Book]:
+        """Возвращает до count самых новых книг, начиная с последнего года."""
+        result: list[Book] = []
+        for year in reversed(self.sorted_years):
+            for book in reversed(self.year_index[year]):
+                if len(result) >= count:
+                    return result
+                result.append(book)
+        return result
+
+
+def make_index(books: Iterable[Book], workers: int = 1, index_dict: IndexDict | None = None) -> IndexDict:
+    """Заполняет index_dict (по умолчанию новый IndexDict) книгами."""
+    if index_dict is None:
+        index_dict = IndexDict()
+    if workers > 1:
+        from .parallel import build_index
+
+        # Родитель создаёт сотни тысяч словарей постингов: сборщик мусора
+        # здесь только тратит время.
+        with _gc_paused():
+            return build_index(list(books), workers, index_dict=index_dict)
+    index_dict.add_many(books)
+    return index_dict
+
+
+def _add_posting(index: dict, key: str | int, book: Book) -> bool:
+    """Добавляет книгу в индекс по ключу. Возвращает True, если ключ новый."""
+    postings = index.get(key)
+    if postings is None:
+        index[key] = {book: None}
+        return True
+    postings[book] = None
+    return False
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Отключает сборщик мусора на время массовой загрузки: создание сотен
+    тысяч книг и словарей иначе запускает его снова и снова впустую.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _merge_postings(index: dict, groups: Mapping) -> None:
+    for key, group in groups.items():
+        postings = index.get(key)
+        if postings is None:
+            index[key] = dict.fromkeys(group)
+        else:
+            postings.update(dict.fromkeys(group))
+
+
+def _remove_posting(index: dict, key: str | int, book: Book) -> bool:
+    """Удаляет книгу из индекса по ключу. Возвращает True, если ключ удалён."""
+    postings = index.get(key)
+    if postings is None:
+        return False
+    postings.pop(book, None)
+    if not postings:
+        del index[key]
+        return True
+    return False
 
 
 class Library:
-    def __init__(self) -> None:
-        self.book_collection: BookCollection = BookCollection()
+    # Максимальный размер журнала изменений, после которого
+    # update_index перестраивает индекс целиком.
+    change_log_limit = 10_000
+
+    def __init__(self, book_collection: "BookCollection | BookStore | None" = None) -> None:
+        if book_collection is None:
+            book_collection = BookCollection()
+        self.book_collection: BookCollection | BookStore = book_collection
         self.index_dict: IndexDict = IndexDict()
+        self.change_log = ChangeLog(self.change_log_limit, owner=self)
+        # Необязательный журнал упреждающей записи (см. wal.WriteAheadLog).
+        self.wal: WriteAheadLog | None = None
+        self._index_deferred = 0
+        self.update_index(full=True)
+        book_collection.change_log = self.change_log
     
     def add_book(self, book: Book) -> None:
-        self.book_collection.add(book)
-        self.index_dict.add(book)
+        if self._index_deferred:
+            self.book_collection.add(book)
+        else:
+            with self.change_log.paused():
+                self.book_collection.add(book)
+            self.index_dict.add(book)
+        object.__setattr__(book, "_library", self)
+        if self.wal is not None:
+            self.wal.log_add(book)
+    
+    def add_books(self, books: Iterable[Book]) -> None:
+        """Добавляет книги пакетом и строит индексы одним сгруппированным проходом."""
+        books = list(books)
+        if self._index_deferred:
+            self.book_collection.extend(books)
+        else:
+            with self.change_log.paused():
+                self.book_collection.extend(books)
+            self.index_dict.add_many(books)
+        for book in books:
+            object.__setattr__(book, "_library", self)
+        if self.wal is not None:
+            for book in books:
+                self.wal.log_add(book)
     
     def remove_book(self, book: Book) -> None:
-        self.book_collection.remove(book)
-        self.index_dict.remove(book)
+        if self._index_deferred:
+            self.book_collection.remove(book)
+        else:
+            with self.change_log.paused():
+                self.book_collection.remove(book)
+            self.index_dict.remove(book)
+        if book._library is self:
+            object.__setattr__(book, "_library", None)
+        if self.wal is not None:
+            self.wal.log_remove(book.isbn)
+    
+    def set_book_field(self, book: Book, field: str, value: object) -> None:
+        """
+        Присваивает поле книги этой библиотеки. Вызывается из
+        Book.__setattr__: сначала обновляется хранилище коллекции,
+        затем слот книги, затем индекс (см. notify_changed).
+        Книга, удалённая из коллекции в обход библиотеки, освобождается.
+        """
+        if book not in self.book_collection:
+            object.__setattr__(book, "_library", None)
+            object.__setattr__(book, field, value)
+            return
+        old_value = getattr(book, field)
+        if old_value != value:
+            self.book_collection.update(book, field, value)
+        object.__setattr__(book, field, value)
+        if old_value != value:
+            self._apply_change(book, field, old_value)
+    
+    def notify_changed(self, book: Book, field: str, old_value: Any) -> None:
+        """
+        Сообщает библиотеке, что поле книги изменено на месте.
+        Индекс переносит книгу сразу, а при отложенном индексе
+        изменение попадает в журнал.
+        """
+        self._apply_change(book, field, old_value)
+    
+    def _apply_change(self, book: Book, field: str, old_value: Any) -> None:
+        if self._index_deferred:
+            self.change_log.record_mutation(book, field, old_value)
+        elif self.index_dict.isbn_index.get(book.isbn if field != "isbn" else old_value) is book:
+            self.index_dict.move(book, field, old_value)
+        if self.wal is not None:
+            # В журнале правка записывается как замена книги целиком.
+            self.wal.log_remove(old_value if field == "isbn" else book.isbn)
+            self.wal.log_add(book)
+    
+    @contextmanager
+    def deferred_index(self) -> Iterator["Library"]:
+        """
+        Приостанавливает обновление индексов на время крупного импорта.
+        При выходе из самого внешнего блока накопленные изменения
+        применяются к индексу один раз.
+        Пока блок открыт, поиск работает по устаревшему индексу.
+        """
+        self._index_deferred += 1
+        try:
+            yield self
+        finally:
+            self._index_deferred -= 1
+            if not self._index_deferred:
+                self.update_index()
     
     def search_by_isbn(self, isbn: str) -> Book | None:
         try:
@@ -105,52 +681,142 @@ class Library:
         except KeyError:
             return None
     
-    def search_by_author(self, author: str) -> BookCollection:
-        result = BookCollection()
-        try:
-            books = self.index_dict[author]
-            if isinstance(books, list):
-                for book in books:
-                    result.add(book)
-            else:
-                result.add(books)
-        except KeyError:
-            pass
-        return result
+    def search_by_author(self, author: str) -> BookView:
+        return self._search(author)
     
-    def search_by_year(self, year: int) -> BookCollection:
-        result = BookCollection()
+    def search_by_year(self, year: int) -> BookView:
+        return self._search(year)
+    
+    def search_by_year_range(self, start: int, end: int) -> BookView:
+        return BookView(lookup=lambda: self.index_dict.year_postings(start, end))
+    
+    def search_newest(self, count: int) -> BookView:
+        return BookView(lookup=lambda: [self.index_dict.newest(count)])
+    
+    def search_by_title(self, title: str) -> BookView:
+        return BookView(lookup=lambda: [self.index_dict.title_index.get(title, {})])
+    
+    def search_by_title_prefix(self, prefix: str) -> BookView:
+        """Книги, название которых начинается с prefix (без учёта регистра и ё/е)."""
+        def lookup() -> list[Collection[Book]]:
+            index = self.index_dict
+            return [index.title_index[title] for title in index.title_search.prefix(prefix)]
+        
+        return BookView(lookup=lookup)
+    
+    def search_by_title_contains(self, text: str) -> BookView:
+        """Книги, название которых содержит text (без учёта регистра и ё/е)."""
+        def lookup() -> list[Collection[Book]]:
+            index = self.index_dict
+            return [index.title_index[title] for title in index.title_search.contains(text)]
+        
+        return BookView(lookup=lookup)
+    
+    def match_authors(
+        self,
+        author: str,
+        max_distance: int = 2,
+        limit: int = 10,
+        time_budget: float | None = None,
+    ) -> list[tuple[str, int]]:
+        """
+        Приближённый поиск авторов: список (автор, расстояние) по возрастанию
+        расстояния. Найденного автора можно передать в search_by_author.
+        """
+        return self.index_dict.author_search.fuzzy(author, max_distance, limit, time_budget)
+    
+    def match_titles(
+        self,
+        title: str,
+        max_distance: int = 2,
+        limit: int = 10,
+        time_budget: float | None = None,
+    ) -> list[tuple[str, int]]:
+        """Приближённый поиск названий, аналогично match_authors."""
+        return self.index_dict.title_search.fuzzy(title, max_distance, limit, time_budget)
+    
+    def search_by_genre(self, genre: str) -> BookView:
+        return BookView(lookup=lambda: [self.index_dict.genre_index.get(genre, {})])
+    
+    def _search(self, key: str | int) -> BookView:
+        return BookView(lookup=lambda: self._postings(key))
+    
+    def _postings(self, key: str | int) -> list[Collection[Book]]:
         try:
-            books = self.index_dict[year]
-            if isinstance(books, list):
-                for book in books:
-                    result.add(book)
-            else:
-                result.add(books)
+            books = self.index_dict[key]
         except KeyError:
-            pass
-        return result
+            return []
+        if isinstance(books, Book):
+            return [(books,)]
+        return [books]
     
-    def search_by_title(self, title: str) -> BookCollection:
-        result = BookCollection()
-        for book in self.book_collection:
-            if book.title == title:
-                result.add(book)
-        return result
+    def save(self, path: str | os.PathLike) -> None:
+        """Сохраняет библиотеку в двоичный снимок (см. snapshot.Snapshot)."""
+        from .snapshot import write_snapshot
+        
+        write_snapshot(self.book_collection, path)
+    
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "Library":
+        """
+        Загружает библиотеку из снимка. Индекс собирается из сохранённых
+        в снимке списков книг по ключам, а не строится заново. Для поиска
+        без загрузки всех книг снимок можно открыть через snapshot.Snapshot.
+        """
+        from .snapshot import Snapshot
+        
+        library = cls()
+        with _gc_paused(), Snapshot(path) as snapshot:
+            books = snapshot.books()
+            index_dict = snapshot.build_index(books, library.book_collection.new_index())
+            with library.change_log.paused():
+                library.book_collection.extend(books)
+            library._adopt(index_dict)
+            library.index_dict = index_dict
+        return library
     
-    def search_by_genre(self, genre: str) -> BookCollection:
+    def query(self, **criteria) -> BookCollection:
+        """
+        Поиск по нескольким условиям сразу: isbn, author, title, genre,
+        year, year_range=(start, end), title_prefix. Книга попадает
+        в результат, если выполнены все переданные условия; префикс
+        названия сравнивается без учёта регистра и ё/е.
+        """
+        plan = plan_query(self.index_dict, **criteria)
         result = BookCollection()
-        for book in self.book_collection:
-            if book.genre == genre:
-                result.add(book)
+        for book in execute_query(plan, self.book_collection):
+            result.add(book)
         return result
     
-    def update_index(self) -> None:
+    def explain(self, **criteria) -> QueryPlan:
+        """Возвращает план запроса query(): используемые индексы и оценки размера."""
+        return plan_query(self.index_dict, **criteria)
+    
+    def update_index(self, full: bool = False, workers: int = 1) -> None:
         """
         Обновляет индекс на основе текущей коллекции книг.
-        Пересоздает все индексы заново.
+        Применяет только изменения из журнала; индекс пересоздаётся
+        заново, если журнал переполнен или передан full=True.
+        При workers > 1 пересоздание группирует книги в пуле процессов.
         """
-        self.index_dict = IndexDict()
-        for book in self.book_collection:
-            self.index_dict.add(book)
-
+        if full or self.change_log.overflowed:
+            index_dict = make_index(self.book_collection, workers, self.book_collection.new_index())
+            self._adopt(index_dict)
+            self.index_dict = index_dict
+        else:
+            self.change_log.apply_to(self.index_dict)
+        self.change_log.clear()
+    
+    def _adopt(self, index_dict: IndexDict) -> None:
+        """
+        Передаёт библиотеке во владение книги нового индекса. Книги
+        старого индекса, которых нет в новом (хранилище создаёт новые
+        объекты при перестроении), освобождаются: их изменения больше
+        не отражаются в библиотеке.
+        """
+        isbn_index = index_dict.isbn_index
+        for book in self.index_dict:
+            if book._library is self and isbn_index.get(book.isbn) is not book:
+                object.__setattr__(book, "_library", None)
+        for book in index_dict:
+            object.__setattr__(book, "_library", self)
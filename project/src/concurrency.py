@@ -0,0 +1,170 @@
+import functools
+import sys
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from .book import Book, BookView, ChangeLog, IndexDict, Library, make_index
+
+
+class ReadWriteLock:
+    """
+    Блокировка читателей и писателей: читать могут многие потоки сразу,
+    писатель получает монопольный доступ. Ожидающий писатель не пропускает
+    вперёд новых читателей, чтобы поток поисков не блокировал запись навсегда.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+def _read_locked(name: str):
+    base = getattr(Library, name)
+
+    @functools.wraps(base)
+    def method(self, *args, **kwargs):
+        with self.lock.read():
+            result = base(self, *args, **kwargs)
+            if isinstance(result, BookView):
+                # Живое представление нельзя отдавать за пределы блокировки.
+                result = BookView([list(result)])
+            return result
+
+    return method
+
+
+class ThreadSafeLibrary(Library):
+    """
+    Библиотека для многопоточного доступа. Поиски выполняются под общей
+    блокировкой чтения и возвращают копию результата, добавление, удаление
+    и обновление индекса — под монопольной блокировкой записи, поэтому
+    коллекция и индекс изменяются атомарно друг относительно друга.
+
+    Полное перестроение индекса не блокирует читателей: новая версия
+    IndexDict строится в стороне, записи, пришедшие во время построения,
+    дописываются в неё, и версия публикуется одной заменой ссылки.
+    Старая версия освобождается, когда на неё не остаётся ссылок.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.lock = ReadWriteLock()
+        self.version = 0
+        self._rebuild_lock = threading.Lock()
+        self._rebuild_log: ChangeLog | None = None
+        super().__init__(*args, **kwargs)
+
+    def add_book(self, book: Book) -> None:
+        with self.lock.write():
+            super().add_book(book)
+            self._track(book, True)
+
+    def add_books(self, books: Iterable[Book]) -> None:
+        books = list(books)
+        with self.lock.write():
+            super().add_books(books)
+            for book in books:
+                self._track(book, True)
+
+    def remove_book(self, book: Book) -> None:
+        with self.lock.write():
+            super().remove_book(book)
+            self._track(book, False)
+
+    def set_book_field(self, book: Book, field: str, value: object) -> None:
+        # Слот книги и перенос в индексе меняются под одной блокировкой,
+        # иначе читатель увидит новое значение поля в старой записи индекса.
+        with self.lock.write():
+            super().set_book_field(book, field, value)
+
+    def notify_changed(self, book: Book, field: str, old_value: Any) -> None:
+        with self.lock.write():
+            super().notify_changed(book, field, old_value)
+
+    def _apply_change(self, book: Book, field: str, old_value: Any) -> None:
+        super()._apply_change(book, field, old_value)
+        if self._rebuild_log is not None:
+            self._rebuild_log.record_mutation(book, field, old_value)
+
+    def update_index(self, full: bool = False, workers: int = 1) -> None:
+        with self.lock.write():
+            if not (full or self.change_log.overflowed):
+                super().update_index()
+                return
+        with self._rebuild_lock:
+            with self.lock.read():
+                books = list(self.book_collection)
+                self.change_log.clear()
+                self._rebuild_log = ChangeLog(sys.maxsize)
+            index_dict = self._build_index(books, workers)
+            with self.lock.write():
+                self._rebuild_log.apply_to(index_dict)
+                self._rebuild_log = None
+                self._adopt(index_dict)
+                self.index_dict = index_dict
+                self.version += 1
+
+    @contextmanager
+    def pinned(self) -> Iterator[IndexDict]:
+        """
+        Закрепляет текущую версию индекса на время нескольких запросов:
+        пока блок открыт, версия не будет заменена. Внутри блока читайте
+        выданный индекс напрямую: повторный захват блокировки чтения
+        при ожидающем писателе приведёт к взаимной блокировке.
+        """
+        with self.lock.read():
+            yield self.index_dict
+
+    def _build_index(self, books: list[Book], workers: int = 1) -> IndexDict:
+        return make_index(books, workers, self.book_collection.new_index())
+
+    def _track(self, book: Book, present: bool) -> None:
+        if self._rebuild_log is not None:
+            self._rebuild_log.record(book, present)
+
+    search_by_isbn = _read_locked("search_by_isbn")
+    search_by_author = _read_locked("search_by_author")
+    search_by_year = _read_locked("search_by_year")
+    search_by_year_range = _read_locked("search_by_year_range")
+    search_newest = _read_locked("search_newest")
+    search_by_title = _read_locked("search_by_title")
+    search_by_title_prefix = _read_locked("search_by_title_prefix")
+    search_by_title_contains = _read_locked("search_by_title_contains")
+    search_by_genre = _read_locked("search_by_genre")
+    match_authors = _read_locked("match_authors")
+    match_titles = _read_locked("match_titles")
+    query = _read_locked("query")
+    explain = _read_locked("explain")
+    save = _read_locked("save")
@@ -0,0 +1,136 @@
+import csv
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+
+from .book import Book, Library
+
+FIELDS = ("title", "author", "year", "genre", "isbn")
+
+
+@dataclass
+class ImportReport:
+    """Итог импорта: принятые и отклонённые строки, время и скорость."""
+
+    rows: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def parse_book(record: dict) -> Book:
+    """Создаёт книгу из записи; при отсутствии полей или неверном годе — ValueError."""
+    missing = [name for name in FIELDS if record.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"нет полей: {', '.join(missing)}")
+    try:
+        year = int(record["year"])
+    except (TypeError, ValueError):
+        raise ValueError(f"неверный год: {record['year']!r}") from None
+    return Book(
+        str(record["title"]),
+        str(record["author"]),
+        year,
+        str(record["genre"]),
+        str(record["isbn"]),
+    )
+
+
+def iter_csv(path: str | os.PathLike) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(file)
+
+
+def iter_jsonl(path: str | os.PathLike) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as error:
+                record = {"_error": f"неверный JSON: {error.msg}"}
+            yield record if isinstance(record, dict) else {"_error": "запись не объект"}
+
+
+def import_books(
+    library: Library,
+    records: Iterable[dict],
+    chunk_size: int = 10_000,
+    max_errors: int = 100,
+) -> ImportReport:
+    """
+    Потоково добавляет записи в библиотеку пакетами по chunk_size через
+    Library.add_books, так что в памяти находится не больше одного пакета.
+    Некорректные записи и повторные ISBN отклоняются и учитываются в отчёте;
+    в errors сохраняются первые max_errors пар (номер записи, причина).
+    Повторы ISBN ищутся и среди уже импортированных пакетов, так как
+    внутри Library.deferred_index они ещё не попали в индекс.
+    """
+    report = ImportReport()
+    imported: set[str] = set()
+    started = time.perf_counter()
+    numbered = enumerate(records, 1)
+    while chunk := list(islice(numbered, chunk_size)):
+        batch: dict[str, Book] = {}
+        for number, record in chunk:
+            try:
+                if "_error" in record:
+                    raise ValueError(record["_error"])
+                book = parse_book(record)
+                if (
+                    book.isbn in batch
+                    or book.isbn in imported
+                    or library.search_by_isbn(book.isbn) is not None
+                ):
+                    raise ValueError(f"ISBN {book.isbn} уже есть в библиотеке")
+            except ValueError as error:
+                report.rejected += 1
+                if len(report.errors) < max_errors:
+                    report.errors.append((number, str(error)))
+                continue
+            batch[book.isbn] = book
+        library.add_books(batch.values())
+        imported.update(batch)
+        report.rows += len(batch)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def import_csv(library: Library, path: str | os.PathLike, chunk_size: int = 10_000) -> ImportReport:
+    return import_books(library, iter_csv(path), chunk_size)
+
+
+def import_jsonl(library: Library, path: str | os.PathLike, chunk_size: int = 10_000) -> ImportReport:
+    return import_books(library, iter_jsonl(path), chunk_size)
+
+
+def export_csv(books: Iterable[Book], path: str | os.PathLike) -> int:
+    """Построчно записывает книги в CSV с заголовком. Возвращает число строк."""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        for book in books:
+            writer.writerow([book.title, book.author, book.year, book.genre, book.isbn])
+            count += 1
+    return count
+
+
+def export_jsonl(books: Iterable[Book], path: str | os.PathLike) -> int:
+    """Построчно записывает книги в JSON Lines. Возвращает число строк."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for book in books:
+            record = {name: getattr(book, name) for name in FIELDS}
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+    return count
@@ -1,9 +1,97 @@
+import argparse
+import json
+import sys
+
 try:
     from .simulation import run_simulation
+    from .workload import EVENT_NAMES, PRESETS, PROFILE_EVENTS, get_profile
 except ImportError:
     from simulation import run_simulation
+    from workload import EVENT_NAMES, PRESETS, PROFILE_EVENTS, get_profile
+
+
+def parse_weight(value: str) -> tuple[str, float]:
+    name, _, weight = value.partition("=")
+    if name not in EVENT_NAMES:
+        raise argparse.ArgumentTypeError(f"неизвестное событие {name!r}, доступны: {', '.join(EVENT_NAMES)}")
+    try:
+        return name, float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"неверный вес {weight!r}") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Псевдослучайная симуляция работы библиотеки")
+    parser.add_argument("--steps", type=int, default=20, help="количество шагов симуляции")
+    parser.add_argument("--seed", type=int, help="seed для генератора случайных чисел")
+    parser.add_argument(
+        "--weight",
+        type=parse_weight,
+        action="append",
+        metavar="СОБЫТИЕ=ВЕС",
+        help=f"вес события; события без веса не выполняются; {', '.join(PROFILE_EVENTS)} — только вместе с --profile",
+    )
+    parser.add_argument(
+        "--profile",
+        help=f"профиль нагрузки: {', '.join(PRESETS)} или путь к JSON-файлу; --weight переопределяет его веса",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "jsonl"),
+        default="text",
+        help="text — обычный вывод, json — итоговая сводка, jsonl — запись на каждый шаг и сводка",
+    )
+    parser.add_argument("--quiet", action="store_true", help="не печатать шаги, только итог")
+    return parser
+
+
+def run_headless(argv: list[str]) -> None:
+    """Запуск без диалога: параметры берутся из командной строки."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.steps <= 0:
+        parser.error("количество шагов должно быть положительным числом")
+    weights = dict(args.weight) if args.weight else None
+    if weights and not args.profile:
+        profile_only = [name for name in PROFILE_EVENTS if name in weights]
+        if profile_only:
+            parser.error(f"события {', '.join(profile_only)} доступны только вместе с --profile")
+    quiet = args.quiet or args.format != "text"
+    trace: list[dict] | None = [] if args.format == "jsonl" else None
+    try:
+        profile = get_profile(args.profile) if args.profile else None
+        stats = run_simulation(
+            steps=args.steps,
+            seed=args.seed,
+            quiet=quiet,
+            weights=weights,
+            trace=trace,
+            profile=profile,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    summary = stats.summary()
+    if trace is not None:
+        lines = [json.dumps(record, ensure_ascii=False) for record in trace]
+        lines.append(json.dumps({"summary": summary}, ensure_ascii=False))
+        sys.stdout.write("\n".join(lines) + "\n")
+    elif args.format == "json":
+        print(json.dumps(summary, ensure_ascii=False))
+    elif quiet:
+        print(f"Шагов: {summary['steps']}, книг: {summary['books']}, "
+              f"{summary['steps_per_second']:.0f} шагов/с")
+        for name, event in summary["events"].items():
+            print(f"  {name}: {event['count']} раз, ошибок {event['errors']}, "
+                  f"в среднем {event['mean_us']:.1f} мкс")
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        run_headless(argv)
+        return
 
-def main() -> None:
     try:
         steps_input = input("Введите количество шагов симуляции (по умолчанию 20): ").strip()
         if steps_input:
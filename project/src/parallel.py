@@ -0,0 +1,174 @@
+import os
+import pickle
+import sys
+import zlib
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from operator import attrgetter
+
+from .book import Book, IndexDict
+from .search import PreparedKeys, TextIndex, normalize
+
+FIELDS = ("author", "year", "title", "genre")
+
+# Поля, ключи которых попадают и в текстовый поиск. Они распределяются
+# по корзинам по нормализованной форме, чтобы ключи с одной формой
+# разбирались вместе.
+TEXT_FIELDS = frozenset(("author", "title"))
+
+# Записи одного поля: ключи, границы (offsets) и номера строк (rows).
+_Postings = tuple[list, array, array]
+
+
+def _bucket_of(field: str, key: object, buckets: int) -> int:
+    # CRC32 не зависит от PYTHONHASHSEED, поэтому все процессы
+    # отправляют один ключ в одну корзину.
+    text = normalize(str(key)) if field in TEXT_FIELDS else str(key)
+    return zlib.crc32(text.encode()) % buckets
+
+
+def _group_rows(start: int, columns: tuple[list, ...], buckets: int) -> list[bytes]:
+    """
+    Первый этап: группирует строки фрагмента по значению каждой колонки
+    и раскладывает ключи по корзинам. Для каждой корзины возвращает
+    упакованные записи всех полей: ключи, границы и номера строк. Родитель
+    передаёт их второму этапу, не распаковывая.
+    """
+    parts: list[list[_Postings]] = [[] for _ in range(buckets)]
+    for field, column in zip(FIELDS, columns):
+        groups: dict[object, list[int]] = {}
+        for row, value in enumerate(column, start):
+            rows = groups.get(value)
+            if rows is None:
+                groups[value] = [row]
+            else:
+                rows.append(row)
+        split: list[_Postings] = [([], array("Q", [0]), array("I")) for _ in range(buckets)]
+        for key, rows in groups.items():
+            keys, offsets, flat = split[_bucket_of(field, key, buckets)]
+            keys.append(key)
+            flat.extend(rows)
+            offsets.append(len(flat))
+        for part, postings in zip(parts, split):
+            part.append(postings)
+    return [pickle.dumps(part, pickle.HIGHEST_PROTOCOL) for part in parts]
+
+
+def _merge_bucket(
+    packed: list[bytes],
+) -> tuple[list[tuple[array, array, array]], PreparedKeys, PreparedKeys]:
+    """
+    Второй этап: собирает одну корзину из всех фрагментов. Фрагменты идут
+    по порядку, поэтому строки каждого ключа остаются возрастающими.
+    Для каждого поля возвращает (firsts, offsets, rows), где firsts —
+    первая строка ключа: по ней родитель восстанавливает порядок ключей.
+    Названия и авторы корзины разбираются через TextIndex.prepare.
+    """
+    merged: list[dict[object, array]] = [{} for _ in FIELDS]
+    for part in map(pickle.loads, packed):
+        for groups, (keys, offsets, flat) in zip(merged, part):
+            for key, low, high in zip(keys, offsets, offsets[1:]):
+                rows = groups.get(key)
+                if rows is None:
+                    groups[key] = flat[low:high]
+                else:
+                    rows.extend(flat[low:high])
+    postings = []
+    prepared = {}
+    for field, groups in zip(FIELDS, merged):
+        firsts = array("I")
+        offsets = array("Q", [0])
+        flat = array("I")
+        for rows in groups.values():
+            firsts.append(rows[0])
+            flat.extend(rows)
+            offsets.append(len(flat))
+        postings.append((firsts, offsets, flat))
+        if field in TEXT_FIELDS:
+            prepared[field] = TextIndex.prepare(map(str, groups))
+    return postings, prepared["title"], prepared["author"]
+
+
+def _chunks(books: list[Book], chunk_size: int) -> Iterator[tuple[list, ...]]:
+    for start in range(0, len(books), chunk_size):
+        chunk = books[start:start + chunk_size]
+        yield tuple(list(map(attrgetter(field), chunk)) for field in FIELDS)
+
+
+def _join_prepared(parts: list[PreparedKeys]) -> PreparedKeys:
+    # Корзины не пересекаются по нормализованным формам, но могут
+    # делить триграммы.
+    originals: dict[str, list[str]] = {}
+    grams: dict[str, list[str]] = {}
+    for part_originals, part_grams in parts:
+        for normalized, keys in part_originals.items():
+            # Строки из другого процесса — копии; интернирование возвращает общие.
+            originals[normalized] = list(map(sys.intern, keys))
+        for trigram, normalized_keys in part_grams.items():
+            grams.setdefault(trigram, []).extend(normalized_keys)
+    return originals, grams
+
+
+def build_index(
+    books: list[Book],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    executor: Executor | None = None,
+    index_dict: IndexDict | None = None,
+) -> IndexDict:
+    """
+    Строит IndexDict в пуле процессов в два этапа. Сначала фрагменты строк
+    группируются параллельно, и ключи каждого фрагмента раскладываются по
+    корзинам; затем каждая корзина собирается из всех фрагментов отдельным
+    процессом вместе с разбором названий и авторов для текстового поиска.
+    Родителю остаются операции над книгами: ISBN-индекс и замена номеров
+    строк книгами, по одной операции Python на различный ключ. Ключи
+    и книги в индексах идут в том же порядке, что и при последовательном
+    IndexDict.add_many. Книги добавляются в index_dict, если он передан.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-len(books) // workers))
+    if index_dict is None:
+        index_dict = IndexDict()
+    index_dict.isbn_index.update(zip(map(attrgetter("isbn"), books), books))
+    if not books:
+        return index_dict
+
+    starts = range(0, len(books), chunk_size)
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        packed = list(executor.map(_group_rows, starts, _chunks(books, chunk_size), [workers] * len(starts)))
+        buckets = list(executor.map(_merge_bucket, [list(parts) for parts in zip(*packed)]))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    groups = []
+    for position, field in enumerate(FIELDS):
+        firsts = array("I")
+        bounds: list[tuple[int, int]] = []
+        rows = array("I")
+        for postings, _, _ in buckets:
+            bucket_firsts, offsets, flat = postings[position]
+            base = len(rows)
+            firsts.extend(bucket_firsts)
+            bounds.extend(zip((base + low for low in offsets), (base + high for high in offsets[1:])))
+            rows.extend(flat)
+        # Ключи — в порядке первого появления, как при последовательном построении;
+        # ключ берём из самой книги, чтобы сохранить интернированную строку.
+        groups.append({
+            getattr(books[firsts[key]], field): map(books.__getitem__, rows[bounds[key][0]:bounds[key][1]])
+            for key in sorted(range(len(firsts)), key=firsts.__getitem__)
+        })
+    by_author, by_year, by_title, by_genre = groups
+    index_dict.merge_groups(
+        by_author,
+        by_year,
+        by_title,
+        by_genre,
+        _join_prepared([titles for _, titles, _ in buckets]),
+        _join_prepared([authors for _, _, authors in buckets]),
+    )
+    return index_dict
@@ -0,0 +1,127 @@
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .book import Book, IndexDict
+
+
+@dataclass
+class QueryStep:
+    """Один предикат запроса, покрытый индексом."""
+
+    predicate: str
+    index: str
+    estimate: int
+    matches: Callable[["Book"], bool] = field(repr=False)
+    source: Callable[[], Iterable["Book"]] = field(repr=False)
+
+    def describe(self) -> str:
+        return f"{self.predicate}: индекс {self.index}, оценка {self.estimate}"
+
+
+@dataclass
+class QueryPlan:
+    """
+    План запроса. Шаги отсортированы по возрастанию оценки:
+    первый задаёт кандидатов, остальные пересекаются с ними.
+    Без условий выполняется полный просмотр коллекции.
+    """
+
+    steps: list[QueryStep]
+    full_scan: bool
+
+    @property
+    def indexes_used(self) -> list[str]:
+        return [step.index for step in self.steps]
+
+    @property
+    def estimate(self) -> int | None:
+        return self.steps[0].estimate if self.steps else None
+
+    def explain(self) -> str:
+        lines = [step.describe() for step in self.steps]
+        if self.full_scan:
+            lines.append("полный просмотр коллекции")
+        return "\n".join(lines)
+
+
+def _source(books: Iterable["Book"]) -> Callable[[], Iterable["Book"]]:
+    return lambda: books
+
+
+def plan_query(
+    index: "IndexDict",
+    *,
+    isbn: str | None = None,
+    author: str | None = None,
+    title: str | None = None,
+    genre: str | None = None,
+    year: int | None = None,
+    year_range: tuple[int, int] | None = None,
+    title_prefix: str | None = None,
+) -> QueryPlan:
+    """Строит план запроса по текущим размерам индексов."""
+    indexed: list[QueryStep] = []
+
+    if isbn is not None:
+        found = index.isbn_index.get(isbn)
+        indexed.append(QueryStep(
+            f"isbn = {isbn!r}",
+            "isbn_index",
+            0 if found is None else 1,
+            lambda book: book.isbn == isbn,
+            lambda: () if found is None else (found,),
+        ))
+    for name, value in (("author", author), ("title", title), ("genre", genre), ("year", year)):
+        if value is None:
+            continue
+        postings = getattr(index, f"{name}_index").get(value, {})
+        indexed.append(QueryStep(
+            f"{name} = {value!r}",
+            f"{name}_index",
+            len(postings),
+            postings.__contains__,
+            _source(postings),
+        ))
+    if year_range is not None:
+        start, end = year_range
+        parts = index.year_postings(start, end)
+        indexed.append(QueryStep(
+            f"{start} <= year <= {end}",
+            "sorted_years",
+            sum(map(len, parts)),
+            lambda book: start <= book.year <= end,
+            lambda: chain.from_iterable(parts),
+        ))
+    if title_prefix is not None:
+        titles = list(index.title_search.prefix(title_prefix))
+        prefixed = set(titles)
+        indexed.append(QueryStep(
+            f"title startswith {title_prefix!r}",
+            "title_search",
+            sum(len(index.title_index[title]) for title in titles),
+            lambda book: book.title in prefixed,
+            lambda: chain.from_iterable(index.title_index[title] for title in titles),
+        ))
+
+    indexed.sort(key=lambda step: step.estimate)
+    return QueryPlan(indexed, full_scan=not indexed)
+
+
+def execute_query(plan: QueryPlan, books: Iterable["Book"]) -> Iterator["Book"]:
+    """
+    Выполняет план. books используется только при полном просмотре,
+    когда не передано ни одного условия.
+    """
+    steps = plan.steps
+    if plan.full_scan:
+        candidates = books
+    else:
+        if steps[0].estimate == 0:
+            return iter(())
+        candidates = steps[0].source()
+        steps = steps[1:]
+    checks = [step.matches for step in steps]
+    return (book for book in candidates if all(check(book) for check in checks))
@@ -0,0 +1,169 @@
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from .simulation import histogram_percentile, run_simulation
+from .workload import WorkloadProfile, get_profile
+
+# Имя для прогонов без профиля: все события равновероятны.
+UNIFORM = "uniform"
+
+
+@dataclass
+class RunResult:
+    """Метрики одного прогона симуляции."""
+
+    seed: int
+    profile: str
+    steps: int
+    books: int
+    seconds: float
+    errors: int
+    histograms: dict[str, dict[int, int]] = field(default_factory=dict)
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.steps / self.seconds if self.seconds > 0 else 0.0
+
+
+def run_one(seed: int, profile: WorkloadProfile | None, steps: int) -> RunResult:
+    """Один прогон симуляции; выполняется в процессе пула."""
+    stats = run_simulation(steps=steps, seed=seed, quiet=True, profile=profile)
+    return RunResult(
+        seed,
+        profile.name if profile is not None else UNIFORM,
+        stats.steps,
+        stats.books,
+        stats.seconds,
+        sum(stats.errors.values()),
+        stats.histograms,
+    )
+
+
+def run_many(
+    seeds: Iterable[int],
+    profiles: Sequence[WorkloadProfile | None] = (None,),
+    steps: int = 1000,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[RunResult]:
+    """
+    Запускает симуляцию для каждой пары (seed, профиль) в пуле процессов.
+    Результаты возвращаются в порядке пар, независимо от порядка завершения.
+    """
+    seeds = list(seeds)
+    pairs = [(seed, profile) for profile in profiles for seed in seeds]
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(run_one, seed, profile, steps) for seed, profile in pairs]
+        return [future.result() for future in futures]
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def confidence_interval(values: Sequence[float], z: float = 1.96) -> tuple[float, float]:
+    """Доверительный интервал для среднего в нормальном приближении (по умолчанию 95%)."""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, mean
+    margin = z * statistics.stdev(values) / math.sqrt(len(values))
+    return mean - margin, mean + margin
+
+
+def _quantile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * q / 100)) - 1]
+
+
+def aggregate(results: Iterable[RunResult]) -> dict[str, dict]:
+    """
+    Сводит прогоны по профилям: среднее, доверительный интервал и процентили
+    скорости по прогонам, размер каталога и процентили задержки каждого
+    события по объединённым гистограммам.
+    """
+    by_profile: dict[str, list[RunResult]] = {}
+    for result in results:
+        by_profile.setdefault(result.profile, []).append(result)
+    report = {}
+    for profile, runs in by_profile.items():
+        speeds = [run.ops_per_second for run in runs]
+        books = [run.books for run in runs]
+        merged: dict[str, dict[int, int]] = {}
+        for run in runs:
+            for event, histogram in run.histograms.items():
+                target = merged.setdefault(event, {})
+                for bucket, count in histogram.items():
+                    target[bucket] = target.get(bucket, 0) + count
+        report[profile] = {
+            "runs": len(runs),
+            "errors": sum(run.errors for run in runs),
+            "ops_per_second": {
+                "mean": statistics.fmean(speeds),
+                "ci95": confidence_interval(speeds),
+                "p5": _quantile(speeds, 5),
+                "p50": _quantile(speeds, 50),
+                "p95": _quantile(speeds, 95),
+            },
+            "books": {
+                "mean": statistics.fmean(books),
+                "ci95": confidence_interval(books),
+                "min": min(books),
+                "max": max(books),
+            },
+            "events": {
+                event: {
+                    "count": sum(histogram.values()),
+                    "p50_us": histogram_percentile(histogram, 50) / 1000,
+                    "p95_us": histogram_percentile(histogram, 95) / 1000,
+                    "p99_us": histogram_percentile(histogram, 99) / 1000,
+                }
+                for event, histogram in merged.items()
+            },
+        }
+    return report
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Параллельный прогон симуляции на многих seed")
+    parser.add_argument("--seeds", type=int, default=100, help="число прогонов на профиль")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument(
+        "--profile",
+        action="append",
+        help=f"профиль нагрузки или путь к JSON; можно указать несколько раз, {UNIFORM} — без профиля",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", help="файл для сводки и результатов прогонов в JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        profiles = [None if name == UNIFORM else get_profile(name) for name in args.profile or [UNIFORM]]
+    except ValueError as error:
+        parser.error(str(error))
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    results = run_many(seeds, profiles, args.steps, args.workers)
+    report = aggregate(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"summary": report, "runs": [asdict(result) for result in results]}, file, ensure_ascii=False)
+    for profile, summary in report.items():
+        speed = summary["ops_per_second"]
+        low, high = speed["ci95"]
+        print(f"{profile}: {summary['runs']} прогонов, {speed['mean']:.0f} шагов/с (95% ДИ {low:.0f}–{high:.0f})")
+        for event, latency in summary["events"].items():
+            print(f"  {event}: p50 {latency['p50_us']:.1f} мкс, p99 {latency['p99_us']:.1f} мкс")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
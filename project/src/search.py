@@ -0,0 +1,220 @@
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит строку к виду для поиска: NFKC, без учёта регистра,
+    "ё" совпадает с "е", пробелы схлопываются. Нестроковые значения
+    приводятся к строке.
+    """
+    text = unicodedata.normalize("NFKC", str(text)).casefold().replace("ё", "е")
+    return " ".join(text.split())
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def edit_distance(left: str, right: str, bound: int) -> int:
+    """
+    Расстояние Левенштейна с ограничением: если оно больше bound,
+    вычисление прекращается досрочно и возвращается bound + 1.
+    """
+    if abs(len(left) - len(right)) > bound:
+        return bound + 1
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, 1):
+        current = [i]
+        for j, right_char in enumerate(right, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (left_char != right_char),
+            ))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
+
+
+# Результат TextIndex.prepare: исходные ключи по нормализованной форме
+# и нормализованные формы по триграмме.
+PreparedKeys = tuple[dict[str, list[str]], dict[str, list[str]]]
+
+
+def _token_sorted(text: str) -> str:
+    return " ".join(sorted(text.split()))
+
+
+class TextIndex:
+    """
+    Индекс различных строковых ключей (например, названий) для поиска
+    по префиксу и подстроке. Префиксы ищутся двоичным поиском по
+    отсортированному массиву нормализованных ключей, подстроки —
+    пересечением списков триграмм с последующей проверкой.
+    """
+
+    def __init__(self) -> None:
+        self.sorted_keys: list[str] = []
+        self.originals: dict[str, dict[str, None]] = {}
+        self.trigram_index: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sorted_keys)
+
+    def add(self, key: str) -> None:
+        normalized = normalize(key)
+        originals = self.originals.get(normalized)
+        if originals is None:
+            originals = self.originals[normalized] = {}
+            insort(self.sorted_keys, normalized)
+            for trigram in trigrams(normalized):
+                self.trigram_index.setdefault(trigram, set()).add(normalized)
+        originals[key] = None
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        """Добавляет ключи пакетом с одной пересортировкой в конце."""
+        new_keys = []
+        for key in keys:
+            normalized = normalize(key)
+            originals = self.originals.get(normalized)
+            if originals is None:
+                originals = self.originals[normalized] = {}
+                new_keys.append(normalized)
+                for trigram in trigrams(normalized):
+                    self.trigram_index.setdefault(trigram, set()).add(normalized)
+            originals[key] = None
+        if new_keys:
+            self.sorted_keys.extend(new_keys)
+            self.sorted_keys.sort()
+
+    @staticmethod
+    def prepare(keys: Iterable[str]) -> PreparedKeys:
+        """
+        Нормализует ключи и собирает их триграммы, не обращаясь к индексу,
+        поэтому может выполняться в другом процессе. Результат присоединяется
+        через add_prepared.
+        """
+        originals: dict[str, list[str]] = {}
+        for key in keys:
+            originals.setdefault(normalize(key), []).append(key)
+        grams: dict[str, list[str]] = {}
+        for normalized in originals:
+            for trigram in trigrams(normalized):
+                grams.setdefault(trigram, []).append(normalized)
+        return originals, grams
+
+    def add_prepared(self, prepared: PreparedKeys) -> None:
+        """То же, что add_many, для ключей, уже разобранных через prepare."""
+        originals, grams = prepared
+        new_keys = []
+        for normalized, keys in originals.items():
+            existing = self.originals.get(normalized)
+            if existing is None:
+                self.originals[normalized] = dict.fromkeys(keys)
+                new_keys.append(normalized)
+            else:
+                existing.update(dict.fromkeys(keys))
+        for trigram, normalized_keys in grams.items():
+            self.trigram_index.setdefault(trigram, set()).update(normalized_keys)
+        if new_keys:
+            self.sorted_keys.extend(new_keys)
+            self.sorted_keys.sort()
+
+    def remove(self, key: str) -> None:
+        normalized = normalize(key)
+        originals = self.originals.get(normalized)
+        if originals is None or key not in originals:
+            return
+        del originals[key]
+        if originals:
+            return
+        del self.originals[normalized]
+        del self.sorted_keys[bisect_left(self.sorted_keys, normalized)]
+        for trigram in trigrams(normalized):
+            keys = self.trigram_index[trigram]
+            keys.discard(normalized)
+            if not keys:
+                del self.trigram_index[trigram]
+
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """Исходные ключи, нормализованная форма которых начинается с prefix."""
+        prefix = normalize(prefix)
+        for position in range(bisect_left(self.sorted_keys, prefix), len(self.sorted_keys)):
+            normalized = self.sorted_keys[position]
+            if not normalized.startswith(prefix):
+                break
+            yield from self.originals[normalized]
+
+    def contains(self, text: str) -> Iterator[str]:
+        """Исходные ключи, нормализованная форма которых содержит text."""
+        text = normalize(text)
+        grams = trigrams(text)
+        if grams:
+            postings = sorted((self.trigram_index.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            matched = sorted(key for key in candidates if text in key)
+        else:
+            # Для запросов короче трёх символов триграмм нет:
+            # просматриваются различные ключи, а не все книги.
+            matched = [key for key in self.sorted_keys if text in key]
+        for normalized in matched:
+            yield from self.originals[normalized]
+
+    def fuzzy(
+        self,
+        text: str,
+        max_distance: int = 2,
+        limit: int = 10,
+        time_budget: float | None = None,
+    ) -> list[tuple[str, int]]:
+        """
+        Приближённый поиск: исходные ключи на расстоянии Левенштейна
+        не больше max_distance от text с учётом перестановки слов
+        ("Достоевский Фёдор" ~ "Фёдор Достоевский"). Кандидаты отбираются
+        по общим триграммам и проверяются в порядке убывания их числа;
+        по истечении time_budget секунд проверка прекращается.
+        Результат отсортирован по расстоянию.
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        text = normalize(text)
+        text_sorted = _token_sorted(text)
+        grams = trigrams(text)
+        # Каждая правка затрагивает не больше трёх триграмм, поэтому
+        # у подходящего ключа не меньше threshold общих триграмм.
+        threshold = len(grams) - 3 * max_distance
+        if threshold > 0:
+            shared: Counter[str] = Counter()
+            for gram in grams:
+                shared.update(self.trigram_index.get(gram, ()))
+            candidates = [key for key, count in shared.most_common() if count >= threshold]
+        else:
+            # Для коротких запросов триграммы ничего не отсекают:
+            # проверяются ключи подходящей длины.
+            candidates = [
+                key for key in self.sorted_keys
+                if abs(len(key) - len(text)) <= max_distance
+            ]
+
+        matches: list[tuple[int, str]] = []
+        for candidate in candidates:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            distance = edit_distance(text, candidate, max_distance)
+            if distance > 0 and " " in text:
+                distance = min(
+                    distance,
+                    edit_distance(text_sorted, _token_sorted(candidate), max_distance),
+                )
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+
+        result: list[tuple[str, int]] = []
+        for distance, normalized in sorted(matches):
+            for key in self.originals[normalized]:
+                result.append((key, distance))
+        return result[:limit]
@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import threading
+import zlib
+from collections.abc import Iterable
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Literal
+
+from .book import Book, BookView, Library
+
+
+def shard_of(isbn: str, shards: int) -> int:
+    """Номер шарда для ISBN. CRC32 не зависит от PYTHONHASHSEED и процесса."""
+    return zlib.crc32(isbn.encode()) % shards
+
+
+def _remove_by_isbn(library: Library, isbn: str) -> None:
+    book = library.search_by_isbn(isbn)
+    if book is None:
+        raise ValueError(f"Книга с ISBN {isbn} не найдена")
+    library.remove_book(book)
+
+
+def _worker(connection: Connection) -> None:
+    library = Library()
+    while (message := connection.recv()) is not None:
+        name, args = message
+        try:
+            if name == "remove_isbn":
+                _remove_by_isbn(library, *args)
+                result = None
+            elif name == "len":
+                result = len(library.book_collection)
+            else:
+                result = getattr(library, name)(*args)
+            if isinstance(result, BookView):
+                result = list(result)
+            connection.send((True, result))
+        except Exception as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class ShardedLibrary:
+    """
+    Библиотека, разделённая по ISBN между процессами-шардами: в каждом
+    процессе своя Library. Поиск по ISBN уходит в один шард, поиски по
+    автору, году, жанру и названию рассылаются всем шардам параллельно,
+    а результаты объединяются в порядке номеров шардов.
+
+    Книги передаются между процессами копиями, поэтому найденные книги
+    не совпадают по identity с добавленными, а изменение их полей не
+    отражается в индексах шардов.
+    """
+
+    def __init__(
+        self,
+        shards: int | None = None,
+        context: Literal["fork", "spawn", "forkserver"] | None = None,
+    ) -> None:
+        self.shards = shards or os.cpu_count() or 1
+        ctx = multiprocessing.get_context(context)
+        self._connections: list[Connection] = []
+        self._locks: list[threading.Lock] = []
+        self._processes: list[BaseProcess] = []
+        for _ in range(self.shards):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+
+    def add_book(self, book: Book) -> None:
+        self._call(shard_of(book.isbn, self.shards), "add_book", book)
+
+    def add_books(self, books: Iterable[Book]) -> None:
+        groups: list[list[Book]] = [[] for _ in range(self.shards)]
+        for book in books:
+            groups[shard_of(book.isbn, self.shards)].append(book)
+        self._scatter("add_books", {shard: (group,) for shard, group in enumerate(groups) if group})
+
+    def remove_book(self, book: Book) -> None:
+        self._call(shard_of(book.isbn, self.shards), "remove_isbn", book.isbn)
+
+    def search_by_isbn(self, isbn: str) -> Book | None:
+        return self._call(shard_of(isbn, self.shards), "search_by_isbn", isbn)
+
+    def search_by_author(self, author: str) -> list[Book]:
+        return self._gather("search_by_author", author)
+
+    def search_by_year(self, year: int) -> list[Book]:
+        return self._gather("search_by_year", year)
+
+    def search_by_genre(self, genre: str) -> list[Book]:
+        return self._gather("search_by_genre", genre)
+
+    def search_by_title(self, title: str) -> list[Book]:
+        return self._gather("search_by_title", title)
+
+    def update_index(self, full: bool = False) -> None:
+        """Обновляет индексы всех шардов одновременно."""
+        self._scatter("update_index", {shard: (full,) for shard in range(self.shards)})
+
+    def __len__(self) -> int:
+        return sum(self._scatter("len", {shard: () for shard in range(self.shards)}))
+
+    def close(self) -> None:
+        for connection, lock in zip(self._connections, self._locks):
+            with lock:
+                if not connection.closed:
+                    connection.send(None)
+                    connection.close()
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> "ShardedLibrary":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _call(self, shard: int, name: str, *args):
+        return self._scatter(name, {shard: args})[0]
+
+    def _gather(self, name: str, *args) -> list[Book]:
+        results = self._scatter(name, {shard: args for shard in range(self.shards)})
+        return [book for result in results for book in result]
+
+    def _scatter(self, name: str, calls: dict[int, tuple]) -> list:
+        """
+        Отправляет вызовы шардам и только затем ждёт ответы, чтобы шарды
+        работали параллельно. Блокируются только каналы затронутых шардов,
+        в порядке их номеров, поэтому вызовы разных шардов не ждут друг друга.
+        """
+        locks = [self._locks[shard] for shard in sorted(calls)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            for shard, args in calls.items():
+                self._connections[shard].send((name, args))
+            replies = [self._connections[shard].recv() for shard in calls]
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        results = []
+        for ok, result in replies:
+            if not ok:
+                raise result
+            results.append(result)
+        return results
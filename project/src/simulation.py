@@ -1,53 +1,70 @@
+import math
 import random
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from itertools import chain, compress
+from typing import TYPE_CHECKING
 from project.src.book import Library, Book
+from project.src.store import BookStore
+
+if TYPE_CHECKING:
+    from project.src.workload import WorkloadProfile
+
+Emit = Callable[[str], None]
 
 
 def generate_random_isbn() -> str:
     return f"{random.randint(100, 999)}-{random.randint(1000000, 9999999)}-{random.randint(100, 999)}-{random.randint(0, 9)}"
 
 
+AUTHORS = [
+    "Лев Толстой",
+    "Фёдор Достоевский",
+    "Антон Чехов",
+    "Александр Пушкин",
+    "Николай Гоголь",
+    "Иван Тургенев",
+    "Михаил Булгаков",
+    "Владимир Набоков",
+    "Александр Солженицын",
+    "Борис Пастернак",
+]
+
+
 def generate_random_author() -> str:
-    authors = [
-        "Лев Толстой",
-        "Фёдор Достоевский",
-        "Антон Чехов",
-        "Александр Пушкин",
-        "Николай Гоголь",
-        "Иван Тургенев",
-        "Михаил Булгаков",
-        "Владимир Набоков",
-        "Александр Солженицын",
-        "Борис Пастернак",
-    ]
-    return random.choice(authors)
+    return random.choice(AUTHORS)
+
+
+GENRES = [
+    "Роман",
+    "Детектив",
+    "Фантастика",
+]
+
+TITLES = [
+    "Война и мир",
+    "Преступление и наказание",
+    "Мастер и Маргарита",
+    "Анна Каренина",
+    "Братья Карамазовы",
+    "Идиот",
+    "Мёртвые души",
+    "Евгений Онегин",
+    "Отцы и дети",
+    "Обломов",
+]
 
 
 def generate_random_genre() -> str:
-    genres = [
-        "Роман",
-        "Детектив",
-        "Фантастика",
-    ]
-    genre = random.choice(genres)
+    genre = random.choice(GENRES)
     if genre == "Роман":
         return "Исторический роман"
     return genre
 
 
 def generate_random_title() -> str:
-    titles = [
-        "Война и мир",
-        "Преступление и наказание",
-        "Мастер и Маргарита",
-        "Анна Каренина",
-        "Братья Карамазовы",
-        "Идиот",
-        "Мёртвые души",
-        "Евгений Онегин",
-        "Отцы и дети",
-        "Обломов",
-    ]
-    return random.choice(titles)
+    return random.choice(TITLES)
 
 
 def generate_random_year() -> int:
@@ -59,89 +76,275 @@ def generate_random_year() -> int:
 def create_random_book() -> Book:
     return Book(
         generate_random_title(),
-        generate_random_year(),
         generate_random_author(),
+        generate_random_year(),
         generate_random_genre(),
         generate_random_isbn(),
     )
 
 
-def event_add_book(library: Library) -> None:
+# Заранее отформатированные части ISBN "ddd-ddddddd-ddd-d": средняя группа
+# собирается из двух частей, а третья группа выбирается вместе с контрольной
+# цифрой, чтобы каждую часть можно было выбрать из списка строк.
+_ISBN_HEADS = [f"{i}-" for i in range(100, 1000)]
+_ISBN_MIDDLE_HIGH = [str(i) for i in range(1000, 10000)]
+_ISBN_MIDDLE_LOW = [f"{i:03d}-" for i in range(1000)]
+_ISBN_TAILS = [f"{i}-{digit}" for i in range(100, 1000) for digit in range(10)]
+# Годы с той же поправкой для круглых значений, что и в generate_random_year.
+_YEARS = [year + 10 if year % 100 == 0 else year for year in range(2025)]
+
+
+def _random_columns(rng: random.Random, n: int, chunk_size: int) -> Iterator[tuple[list, ...]]:
+    """
+    Колонки (названия, авторы, годы, жанры, ISBN) для n книг пакетами по
+    chunk_size. Каждое поле пакета выбирается одним вызовом rng.choices
+    из готового списка значений. Повторные ISBN отбрасываются, и недостающие
+    книги добираются в следующем пакете.
+    """
+    genres = ["Исторический роман" if genre == "Роман" else genre for genre in GENRES]
+    seen: set[str] = set()
+    remaining = n
+    while remaining:
+        size = min(remaining, chunk_size)
+        titles = rng.choices(TITLES, k=size)
+        authors = rng.choices(AUTHORS, k=size)
+        years = rng.choices(_YEARS, k=size)
+        genre_column = rng.choices(genres, k=size)
+        isbns = list(map("".join, zip(
+            rng.choices(_ISBN_HEADS, k=size),
+            rng.choices(_ISBN_MIDDLE_HIGH, k=size),
+            rng.choices(_ISBN_MIDDLE_LOW, k=size),
+            rng.choices(_ISBN_TAILS, k=size),
+        )))
+        columns: tuple[list, ...] = (titles, authors, years, genre_column, isbns)
+        if seen.isdisjoint(isbns) and len(set(isbns)) == size:
+            seen.update(isbns)
+        else:
+            fresh = []
+            for isbn in isbns:
+                fresh.append(isbn not in seen)
+                seen.add(isbn)
+            columns = tuple(list(compress(column, fresh)) for column in columns)
+        remaining -= len(columns[0])
+        yield columns
+
+
+def create_random_books(
+    n: int,
+    seed: int | None = None,
+    columnar: bool = False,
+    chunk_size: int = 100_000,
+) -> Iterator[Book] | BookStore:
+    """
+    Создаёт n случайных книг с уникальными ISBN. При одинаковых n, seed
+    и chunk_size книги получаются одинаковыми. По умолчанию возвращает ленивый итератор книг; при columnar=True —
+    BookStore, заполненный напрямую колонками, без создания объектов Book.
+    """
+    chunks = _random_columns(random.Random(seed), n, chunk_size)
+    if columnar:
+        store = BookStore()
+        for columns in chunks:
+            store.extend_columns(*columns)
+        return store
+    return chain.from_iterable(map(Book, *columns) for columns in chunks)
+
+
+def event_add_book(library: Library, emit: Emit | None = print) -> None:
     book = create_random_book()
     library.add_book(book)
-    print(f"Добавлена книга: '{book.title}' автора {book.author}")
+    if emit is not None:
+        emit(f"Добавлена книга: '{book.title}' автора {book.author}")
 
 
-def event_remove_random_book(library: Library) -> None:
+def event_remove_random_book(library: Library, emit: Emit | None = print) -> None:
     if len(library.book_collection) == 0:
-        print("Нет книг для удаления")
+        if emit is not None:
+            emit("Нет книг для удаления")
         return
     
-    random_book = random.choice(library.book_collection.books)
+    random_book = library.book_collection.random_book()
     library.remove_book(random_book)
-    print(f"Удалена книга: '{random_book.title}' автора {random_book.author}")
+    if emit is not None:
+        emit(f"Удалена книга: '{random_book.title}' автора {random_book.author}")
 
 
-def event_search_by_author(library: Library) -> None:
+def event_search_by_author(library: Library, emit: Emit | None = print) -> None:
     author = generate_random_author()
     results = library.search_by_author(author)
-    print(f"Поиск по автору '{author}': найдено {len(results)} книг")
+    if emit is not None:
+        emit(f"Поиск по автору '{author}': найдено {len(results)} книг")
 
 
-def event_search_by_genre(library: Library) -> None:
+def event_search_by_genre(library: Library, emit: Emit | None = print) -> None:
     genre = generate_random_genre()
     results = library.search_by_genre(genre)
-    print(f"Поиск по жанру '{genre}': найдено {len(results)} книг")
+    if emit is not None:
+        emit(f"Поиск по жанру '{genre}': найдено {len(results)} книг")
 
 
-def event_search_by_year(library: Library) -> None:
+def event_search_by_year(library: Library, emit: Emit | None = print) -> None:
     year = generate_random_year()
     results = library.search_by_year(year)
-    print(f"Поиск по году {year}: найдено {len(results)} книг")
+    if emit is not None:
+        emit(f"Поиск по году {year}: найдено {len(results)} книг")
 
 
-def event_update_index(library: Library) -> None:
+def event_update_index(library: Library, emit: Emit | None = print) -> None:
     library.update_index()
-    print(f"Индекс обновлен. Всего книг в индексе: {len(library.index_dict)}")
+    if emit is not None:
+        emit(f"Индекс обновлен. Всего книг в индексе: {len(library.index_dict)}")
 
 
-def event_search_nonexistent_book(library: Library) -> None:
+def event_search_nonexistent_book(library: Library, emit: Emit | None = print) -> None:
     nonexistent_isbn = generate_random_isbn()
     book = library.search_by_isbn(nonexistent_isbn)
+    if emit is None:
+        return
     if book is None:
-        print(f"Попытка найти книгу с ISBN {nonexistent_isbn}: книга не найдена (корректная обработка)")
+        emit(f"Попытка найти книгу с ISBN {nonexistent_isbn}: книга не найдена (корректная обработка)")
     else:
-        print(f"Неожиданно найдена книга с ISBN {nonexistent_isbn}")
+        emit(f"Неожиданно найдена книга с ISBN {nonexistent_isbn}")
+
+
+EVENTS = [
+    ("add_book", event_add_book),
+    ("remove_book", event_remove_random_book),
+    ("search_author", event_search_by_author),
+    ("search_genre", event_search_by_genre),
+    ("search_year", event_search_by_year),
+    ("update_index", event_update_index),
+    ("search_nonexistent", event_search_nonexistent_book),
+]
+
+
+# Число корзин гистограммы задержек на каждое удвоение времени:
+# при 4 корзинах погрешность процентиля не превышает 10%.
+HISTOGRAM_RESOLUTION = 4
+
+
+def histogram_bucket(nanoseconds: int) -> int:
+    return int(math.log2(nanoseconds + 1) * HISTOGRAM_RESOLUTION)
+
 
+def histogram_percentile(histogram: dict[int, int], q: float) -> float:
+    """Процентиль q (0..100) по гистограмме задержек, в наносекундах (середина корзины)."""
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    rank = max(1, math.ceil(total * q / 100))
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= rank:
+            break
+    return 2 ** ((bucket + 0.5) / HISTOGRAM_RESOLUTION) - 1
 
-def run_simulation(steps: int = 20, seed: int | None = None) -> None:
+
+@dataclass
+class SimulationStats:
+    """Счётчики, суммарное время и гистограммы задержек событий за прогон симуляции."""
+
+    steps: int = 0
+    books: int = 0
+    seconds: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    nanoseconds: dict[str, int] = field(default_factory=dict)
+    histograms: dict[str, dict[int, int]] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        events = {
+            name: {
+                "count": count,
+                "errors": self.errors.get(name, 0),
+                "mean_us": self.nanoseconds[name] / count / 1000,
+                "p50_us": histogram_percentile(self.histograms[name], 50) / 1000,
+                "p99_us": histogram_percentile(self.histograms[name], 99) / 1000,
+            }
+            for name, count in self.counts.items()
+        }
+        return {
+            "steps": self.steps,
+            "books": self.books,
+            "seconds": self.seconds,
+            "steps_per_second": self.steps / self.seconds if self.seconds > 0 else 0.0,
+            "events": events,
+        }
+
+
+def run_simulation(
+    steps: int = 20,
+    seed: int | None = None,
+    quiet: bool = False,
+    weights: dict[str, float] | None = None,
+    trace: list[dict] | None = None,
+    profile: "WorkloadProfile | None" = None,
+) -> SimulationStats:
+    """
+    Запускает симуляцию. В режиме quiet ничего не печатается, а события
+    только считаются и замеряются. weights задаёт веса событий по именам
+    (по умолчанию события равновероятны). Если передан список trace,
+    в него добавляется запись о каждом шаге. Профиль нагрузки задаёт набор
+    событий, веса по умолчанию и число книг, добавляемых до первого шага.
+    """
     if seed is not None:
         random.seed(seed)
     
     library = Library()
-    events = [
-        ("add_book", event_add_book),
-        ("remove_book", event_remove_random_book),
-        ("search_author", event_search_by_author),
-        ("search_genre", event_search_by_genre),
-        ("search_year", event_search_by_year),
-        ("update_index", event_update_index),
-        ("search_nonexistent", event_search_nonexistent_book),
-    ]
+    events = EVENTS
+    if profile is not None:
+        events = profile.events()
+        weights = weights if weights is not None else profile.weights
+        library.add_books(create_random_book() for _ in range(profile.warmup))
+    if weights is not None:
+        unknown = set(weights) - {name for name, _ in events}
+        if unknown:
+            raise ValueError(f"Неизвестные события: {', '.join(sorted(unknown))}")
+        events = [(name, func) for name, func in events if weights.get(name, 0) > 0]
+        if not events:
+            raise ValueError("Ни у одного события нет положительного веса")
+        event_weights = [weights[name] for name, _ in events]
+    emit = None if quiet else print
+    stats = SimulationStats()
+    clock = time.perf_counter_ns
     
-    print(f"[СИМУЛЯЦИЯ] Начало симуляции библиотеки")
-    print(f"[СИМУЛЯЦИЯ] Количество шагов: {steps}")
-    if seed is not None:
-        print(f"[СИМУЛЯЦИЯ] Seed: {seed}")
+    if not quiet:
+        print(f"[СИМУЛЯЦИЯ] Начало симуляции библиотеки")
+        print(f"[СИМУЛЯЦИЯ] Количество шагов: {steps}")
+        if seed is not None:
+            print(f"[СИМУЛЯЦИЯ] Seed: {seed}")
     
+    started = clock()
     for step in range(1, steps):
-        event_name, event_func = random.choice(events)
-        print(f"[Шаг {step:3d}] Событие: {event_name}")
+        if weights is None:
+            event_name, event_func = random.choice(events)
+        else:
+            event_name, event_func = random.choices(events, event_weights)[0]
+        if not quiet:
+            print(f"[Шаг {step:3d}] Событие: {event_name}")
+        error = None
+        before = clock()
         try:
-            event_func(library)
+            event_func(library, emit)
         except Exception as e:
-            print(f"[Шаг {step:3d}] Ошибка при выполнении события: {e}")
-        print()
-    print(f"[СИМУЛЯЦИЯ] Симуляция завершена")
-    print(f"[СИМУЛЯЦИЯ] Всего книг в библиотеке: {len(library.book_collection)}")
-
+            error = str(e)
+            stats.errors[event_name] = stats.errors.get(event_name, 0) + 1
+            if not quiet:
+                print(f"[Шаг {step:3d}] Ошибка при выполнении события: {e}")
+        elapsed = clock() - before
+        stats.counts[event_name] = stats.counts.get(event_name, 0) + 1
+        stats.nanoseconds[event_name] = stats.nanoseconds.get(event_name, 0) + elapsed
+        histogram = stats.histograms.setdefault(event_name, {})
+        bucket = histogram_bucket(elapsed)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        stats.steps += 1
+        if trace is not None:
+            trace.append({"step": step, "event": event_name, "us": elapsed / 1000, "error": error})
+        if not quiet:
+            print()
+    stats.seconds = (clock() - started) / 1e9
+    stats.books = len(library.book_collection)
+    if not quiet:
+        print(f"[СИМУЛЯЦИЯ] Симуляция завершена")
+        print(f"[СИМУЛЯЦИЯ] Всего книг в библиотеке: {len(library.book_collection)}")
+    return stats
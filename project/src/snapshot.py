@@ -0,0 +1,310 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from operator import attrgetter
+from typing import Literal, TypeVar
+
+from .book import Book, IndexDict
+
+# Коды типов колонок снимка для memoryview.cast.
+_Typecode = Literal["i", "I", "Q"]
+_Key = TypeVar("_Key", str, int)
+
+MAGIC = b"LIBSNAP1"
+VERSION = 1
+
+# Порядок секций в файле. Каждая секция выровнена по 8 байтам,
+# а её смещение и длина записаны в заголовке.
+SECTIONS = (
+    "years",
+    "title_codes",
+    "author_codes",
+    "genre_codes",
+    "isbn_offsets",
+    "isbn_data",
+    "isbn_order",
+    "title_offsets",
+    "title_data",
+    "title_posting_offsets",
+    "title_postings",
+    "author_offsets",
+    "author_data",
+    "author_posting_offsets",
+    "author_postings",
+    "genre_offsets",
+    "genre_data",
+    "genre_posting_offsets",
+    "genre_postings",
+    "year_keys",
+    "year_posting_offsets",
+    "year_postings",
+)
+
+_HEADER = struct.Struct("<8sIIQ")
+_SECTION = struct.Struct("<QQ")
+
+
+def _string_table(values: Iterable[str]) -> tuple[list[str], dict[str, int]]:
+    """Отсортированная таблица строк: код строки равен её позиции."""
+    table = sorted(set(values))
+    return table, {value: code for code, value in enumerate(table)}
+
+
+def _pack_strings(strings: list[str]) -> tuple[array, bytes]:
+    offsets = array("Q", [0])
+    data = bytearray()
+    for value in strings:
+        data += value.encode()
+        offsets.append(len(data))
+    return offsets, bytes(data)
+
+
+def _pack_postings(codes: Iterable[int], size: int) -> tuple[array, array]:
+    """Номера строк, сгруппированные по коду, в порядке коллекции."""
+    groups: list[list[int]] = [[] for _ in range(size)]
+    for row, code in enumerate(codes):
+        groups[code].append(row)
+    offsets = array("Q", [0])
+    rows = array("I")
+    for group in groups:
+        rows.extend(group)
+        offsets.append(len(rows))
+    return offsets, rows
+
+
+def write_snapshot(books: Iterable[Book], path: str | os.PathLike) -> None:
+    """
+    Записывает книги в двоичный снимок: колонки фиксированной ширины,
+    таблицы строк и готовые списки книг по каждому ключу индекса.
+    Файл сначала пишется во временный и затем атомарно заменяет path.
+    """
+    books = list(books)
+    titles, title_codes = _string_table(book.title for book in books)
+    authors, author_codes = _string_table(book.author for book in books)
+    genres, genre_codes = _string_table(book.genre for book in books)
+    year_keys = array("i", sorted({book.year for book in books}))
+    year_codes = {year: code for code, year in enumerate(year_keys)}
+    isbns = [book.isbn for book in books]
+
+    columns: dict[str, array | bytes] = {
+        "years": array("i", (book.year for book in books)),
+        "title_codes": array("I", (title_codes[book.title] for book in books)),
+        "author_codes": array("I", (author_codes[book.author] for book in books)),
+        "genre_codes": array("I", (genre_codes[book.genre] for book in books)),
+        "isbn_order": array("I", sorted(range(len(books)), key=isbns.__getitem__)),
+        "year_keys": year_keys,
+    }
+    columns["isbn_offsets"], columns["isbn_data"] = _pack_strings(isbns)
+    for name, strings in (("title", titles), ("author", authors), ("genre", genres)):
+        columns[f"{name}_offsets"], columns[f"{name}_data"] = _pack_strings(strings)
+        columns[f"{name}_posting_offsets"], columns[f"{name}_postings"] = _pack_postings(
+            columns[f"{name}_codes"], len(strings)
+        )
+    columns["year_posting_offsets"], columns["year_postings"] = _pack_postings(
+        (year_codes[year] for year in columns["years"]), len(year_keys)
+    )
+
+    header_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+    position = header_size
+    table = []
+    payloads = []
+    for name in SECTIONS:
+        payload = columns[name]
+        payload = payload if isinstance(payload, bytes) else payload.tobytes()
+        padding = -position % 8
+        position += padding
+        table.append((position, len(payload)))
+        payloads.append((padding, payload))
+        position += len(payload)
+
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, len(books)))
+        for offset, length in table:
+            file.write(_SECTION.pack(offset, length))
+        for padding, payload in payloads:
+            file.write(b"\0" * padding)
+            file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class Snapshot:
+    """
+    Снимок библиотеки, отображённый в память через mmap. Файл не
+    разбирается при открытии: колонки читаются напрямую из отображения,
+    поиск по ISBN и строковым ключам идёт двоичным поиском, а книги
+    создаются только для найденных строк.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, _, self._count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Файл {path} не является снимком библиотеки")
+        self._sections: dict[str, memoryview] = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(self._mmap, _HEADER.size + i * _SECTION.size)
+            self._sections[name] = self._view[offset:offset + length]
+        self._columns: dict[str, memoryview] = {}
+
+    def close(self) -> None:
+        self._sections = {}
+        self._columns = {}
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Book]:
+        return map(self.book, range(self._count))
+
+    def books(self) -> list[Book]:
+        """
+        Все книги снимка в порядке коллекции. Строковые таблицы
+        декодируются и интернируются один раз, а не для каждой книги,
+        как в book().
+        """
+        titles = list(map(sys.intern, self._strings("title")))
+        authors = list(map(sys.intern, self._strings("author")))
+        genres = list(map(sys.intern, self._strings("genre")))
+        return Book.from_columns(
+            map(titles.__getitem__, self._column("title_codes", "I")),
+            map(authors.__getitem__, self._column("author_codes", "I")),
+            self._column("years", "i"),
+            map(genres.__getitem__, self._column("genre_codes", "I")),
+            self._isbns(),
+        )
+
+    def build_index(self, books: list[Book], index_dict: IndexDict | None = None) -> IndexDict:
+        """
+        Строит индекс для books, полученных из books(), по сохранённым
+        в снимке спискам книг по каждому ключу, без группировки заново.
+        """
+        if index_dict is None:
+            index_dict = IndexDict()
+        index_dict.isbn_index.update(zip(map(attrgetter("isbn"), books), books))
+        index_dict.merge_groups(
+            self._groups("author", self._strings("author"), books),
+            self._groups("year", self._column("year_keys", "i"), books),
+            self._groups("title", self._strings("title"), books),
+            self._groups("genre", self._strings("genre"), books),
+        )
+        return index_dict
+
+    def _groups(self, table: str, keys: Iterable[_Key], books: list[Book]) -> dict[_Key, Iterator[Book]]:
+        # Итераторы, а не списки: их сразу поглощает dict.fromkeys в merge_groups.
+        offsets = self._column(f"{table}_posting_offsets", "Q")
+        rows = self._column(f"{table}_postings", "I")
+        return {
+            key: map(books.__getitem__, rows[offsets[code]:offsets[code + 1]])
+            for code, key in enumerate(keys)
+        }
+
+    def book(self, row: int) -> Book:
+        return Book(
+            self._string("title", self._column("title_codes", "I")[row]),
+            self._string("author", self._column("author_codes", "I")[row]),
+            self._column("years", "i")[row],
+            self._string("genre", self._column("genre_codes", "I")[row]),
+            self._isbn(row).decode(),
+        )
+
+    def search_by_isbn(self, isbn: str) -> Book | None:
+        order = self._column("isbn_order", "I")
+        key = isbn.encode()
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._isbn(order[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self._isbn(order[low]) == key:
+            return self.book(order[low])
+        return None
+
+    def search_by_author(self, author: str) -> list[Book]:
+        return self._search_string("author", author)
+
+    def search_by_title(self, title: str) -> list[Book]:
+        return self._search_string("title", title)
+
+    def search_by_genre(self, genre: str) -> list[Book]:
+        return self._search_string("genre", genre)
+
+    def search_by_year(self, year: int) -> list[Book]:
+        keys = self._column("year_keys", "i")
+        low, high = 0, len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if keys[middle] < year:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(keys) or keys[low] != year:
+            return []
+        return self._postings("year", low)
+
+    def _column(self, name: str, typecode: _Typecode) -> memoryview:
+        column = self._columns.get(name)
+        if column is None:
+            section = self._sections[name]
+            column = self._columns[name] = section.cast("B").cast(typecode)
+        return column
+
+    def _isbn(self, row: int) -> bytes:
+        offsets = self._column("isbn_offsets", "Q")
+        return bytes(self._sections["isbn_data"][offsets[row]:offsets[row + 1]])
+
+    def _strings(self, table: str) -> list[str]:
+        offsets = self._column(f"{table}_offsets", "Q")
+        data = self._sections[f"{table}_data"]
+        return [str(data[start:end], "utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def _isbns(self) -> list[str]:
+        offsets = self._column("isbn_offsets", "Q")
+        data = bytes(self._sections["isbn_data"])
+        if data.isascii():
+            # Для ASCII смещения в байтах совпадают со смещениями в строке.
+            text = data.decode()
+            return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        return [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+    def _string(self, table: str, code: int) -> str:
+        offsets = self._column(f"{table}_offsets", "Q")
+        return str(self._sections[f"{table}_data"][offsets[code]:offsets[code + 1]], "utf-8")
+
+    def _search_string(self, table: str, value: str) -> list[Book]:
+        offsets = self._column(f"{table}_offsets", "Q")
+        data = self._sections[f"{table}_data"]
+        key = value.encode()
+        low, high = 0, len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(data[offsets[middle]:offsets[middle + 1]]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(offsets) - 1 or bytes(data[offsets[low]:offsets[low + 1]]) != key:
+            return []
+        return self._postings(table, low)
+
+    def _postings(self, table: str, code: int) -> list[Book]:
+        offsets = self._column(f"{table}_posting_offsets", "Q")
+        rows = self._column(f"{table}_postings", "I")
+        return [self.book(row) for row in rows[offsets[code]:offsets[code + 1]]]
@@ -0,0 +1,298 @@
+import random
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from itertools import accumulate, compress, count, islice
+from operator import and_
+from typing import Any
+
+from .book import Book, ChangeLog, IndexDict
+
+
+class StringTable:
+    """Словарное кодирование строк: каждая различная строка хранится один раз."""
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode_many(self, values: Iterable[str]) -> Iterator[int]:
+        """
+        Коды для values, такие же, как при encode по одному. Новые строки
+        добавляются по одному разу, а сами коды берутся из словаря без
+        вызова метода на каждый элемент.
+        """
+        values = list(values)
+        for value in dict.fromkeys(values):
+            self.encode(value)
+        return map(self.codes.__getitem__, values)
+
+    def lookup(self, value: str) -> int | None:
+        return self.codes.get(value)
+
+
+class BookStore:
+    """
+    Колоночное хранилище книг с тем же интерфейсом, что и BookCollection.
+    Год хранится в array('i'), автор, жанр и название — кодами в array('I'),
+    ISBN — в упакованной байтовой таблице. Объекты Book создаются только
+    при чтении результата.
+    """
+
+    def __init__(self, books: Iterable[Book] = ()) -> None:
+        self.years = array("i")
+        self.author_codes = array("I")
+        self.genre_codes = array("I")
+        self.title_codes = array("I")
+        self.authors = StringTable()
+        self.genres = StringTable()
+        self.titles = StringTable()
+        self._isbn_data = bytearray()
+        self._isbn_offsets = array("Q", [0])
+        self._alive = bytearray()
+        self._rows: dict[str, int] = {}
+        self.change_log: ChangeLog | None = None
+        for book in books:
+            self.add(book)
+
+    @property
+    def books(self) -> list[Book]:
+        return list(self)
+
+    def __getitem__(self, key: int | slice) -> Book | list[Book]:
+        rows: Sequence[int]
+        if len(self._alive) == len(self._rows):
+            rows = range(len(self._alive))
+        else:
+            rows = list(self.live_rows())
+        if isinstance(key, slice):
+            return list(self._books(rows[key]))
+        if not -len(rows) <= key < len(rows):
+            raise IndexError("индекс вне диапазона хранилища")
+        return next(self._books((rows[key],)))
+
+    def __iter__(self) -> Iterator[Book]:
+        return self._books(self.live_rows())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, book: object) -> bool:
+        return isinstance(book, Book) and book.isbn in self._rows
+
+    def add(self, book: Book) -> None:
+        if book.isbn in self._rows:
+            raise ValueError(f"Книга с ISBN {book.isbn} уже есть в хранилище")
+        self._append(book.title, book.author, book.year, book.genre, book.isbn)
+        if self.change_log is not None:
+            self.change_log.record(book, True)
+
+    def update(self, book: Book, field: str, value: Any) -> None:
+        """
+        Записывает новое значение поля книги в колонки. Вызывается
+        библиотекой до присваивания, пока book хранит старое значение.
+        Новый ISBN не помещается в упакованную таблицу на место старого,
+        поэтому при смене ISBN книга переносится в конец хранилища.
+        """
+        row = self._rows.get(book.isbn)
+        if row is None:
+            return
+        if field == "isbn":
+            if value in self._rows:
+                raise ValueError(f"Книга с ISBN {value} уже есть в хранилище")
+            del self._rows[book.isbn]
+            self._alive[row] = 0
+            self._append(book.title, book.author, book.year, book.genre, value)
+        elif field == "year":
+            self.years[row] = value
+        elif field == "author":
+            self.author_codes[row] = self.authors.encode(value)
+        elif field == "genre":
+            self.genre_codes[row] = self.genres.encode(value)
+        elif field == "title":
+            self.title_codes[row] = self.titles.encode(value)
+
+    def extend(self, books: Iterable[Book]) -> None:
+        for book in books:
+            self.add(book)
+
+    def extend_columns(
+        self,
+        titles: list[str],
+        authors: list[str],
+        years: list[int],
+        genres: list[str],
+        isbns: list[str],
+    ) -> None:
+        """
+        Добавляет книги, заданные колонками, не создавая объектов Book.
+        Если хотя бы один ISBN повторяется, ничего не добавляется.
+        """
+        start = len(self._alive)
+        rows = dict(zip(isbns, range(start, start + len(isbns))))
+        if len(rows) != len(isbns) or not self._rows.keys().isdisjoint(rows):
+            raise ValueError("ISBN повторяется или уже есть в хранилище")
+        self._rows.update(rows)
+        self.years.extend(years)
+        self.author_codes.extend(self.authors.encode_many(authors))
+        self.genre_codes.extend(self.genres.encode_many(genres))
+        self.title_codes.extend(self.titles.encode_many(titles))
+        encoded = list(map(str.encode, isbns))
+        offsets = accumulate(map(len, encoded), initial=len(self._isbn_data))
+        self._isbn_offsets.extend(islice(offsets, 1, None))
+        self._isbn_data += b"".join(encoded)
+        self._alive.extend(b"\x01" * len(isbns))
+        if self.change_log is not None:
+            for book in self.books_at(range(start, len(self._alive))):
+                self.change_log.record(book, True)
+
+    def remove(self, book: Book) -> None:
+        row = self._rows.pop(book.isbn, None)
+        if row is None:
+            raise ValueError(f"Книга с ISBN {book.isbn} не найдена")
+        self._alive[row] = 0
+        if len(self._alive) > 2 * len(self._rows):
+            self._compact()
+        if self.change_log is not None:
+            self.change_log.record(book, False)
+
+    def random_book(self, randrange: Callable[[int], int] = random.randrange) -> Book:
+        """Случайная книга за O(1) в среднем, как BookCollection.random_book."""
+        if not self._rows:
+            raise IndexError("хранилище пусто")
+        while True:
+            row = randrange(len(self._alive))
+            if self._alive[row]:
+                return next(self._books((row,)))
+
+    def live_rows(self) -> Iterator[int]:
+        return compress(count(), self._alive)
+
+    def books_at(self, rows: Iterable[int]) -> Iterator[Book]:
+        """Лениво создаёт книги для переданных номеров строк."""
+        return map(self._materialize, rows)
+
+    def rows_with_genre(self, genre: str) -> list[int]:
+        code = self.genres.lookup(genre)
+        if code is None:
+            return []
+        return self._select(map(code.__eq__, self.genre_codes))
+
+    def rows_with_year(self, year: int) -> list[int]:
+        return self._select(map(year.__eq__, self.years))
+
+    def rows_with_author(self, author: str) -> list[int]:
+        code = self.authors.lookup(author)
+        if code is None:
+            return []
+        return self._select(map(code.__eq__, self.author_codes))
+
+    def rows_in_year_range(self, start: int, end: int) -> list[int]:
+        return self._select(
+            map(and_, map(start.__le__, self.years), map(end.__ge__, self.years))
+        )
+
+    def isbn_at(self, row: int) -> str:
+        return self._isbn_data[self._isbn_offsets[row]:self._isbn_offsets[row + 1]].decode()
+
+    def isbns_at(self, rows: Iterable[int]) -> Iterator[str]:
+        data, offsets = self._isbn_data, self._isbn_offsets
+        return (data[offsets[row]:offsets[row + 1]].decode() for row in rows)
+
+    def new_index(self) -> "ColumnIndexDict":
+        """Пустой индекс, который Library строит поверх этого хранилища."""
+        return ColumnIndexDict(self)
+
+    def _books(self, rows: Iterable[int]) -> Iterator[Book]:
+        """
+        Книги для строк при чтении коллекции. Если хранилище принадлежит
+        библиотеке, возвращаются проиндексированные ею объекты: изменение
+        их полей доходит до хранилища и индекса.
+        """
+        owner = self.change_log.owner if self.change_log is not None else None
+        if owner is not None and isinstance(owner.index_dict, ColumnIndexDict):
+            return owner.index_dict.books_at(rows)
+        return self.books_at(rows)
+
+    def _select(self, mask: Iterable[bool]) -> list[int]:
+        # Сравнения выполняются поэлементно над непрерывными массивами
+        # внутри map/compress, без байткода Python на каждую строку.
+        return list(compress(count(), map(and_, mask, self._alive)))
+
+    def _append(self, title: str, author: str, year: int, genre: str, isbn: str) -> None:
+        self._rows[isbn] = len(self._alive)
+        self.years.append(year)
+        self.author_codes.append(self.authors.encode(author))
+        self.genre_codes.append(self.genres.encode(genre))
+        self.title_codes.append(self.titles.encode(title))
+        self._isbn_data += isbn.encode()
+        self._isbn_offsets.append(len(self._isbn_data))
+        self._alive.append(1)
+
+    def _materialize(self, row: int) -> Book:
+        start, end = self._isbn_offsets[row], self._isbn_offsets[row + 1]
+        return Book(
+            self.titles.values[self.title_codes[row]],
+            self.authors.values[self.author_codes[row]],
+            self.years[row],
+            self.genres.values[self.genre_codes[row]],
+            self._isbn_data[start:end].decode(),
+        )
+
+    def _compact(self) -> None:
+        rows = list(self.live_rows())
+        self.years = array("i", (self.years[row] for row in rows))
+        self.author_codes = array("I", (self.author_codes[row] for row in rows))
+        self.genre_codes = array("I", (self.genre_codes[row] for row in rows))
+        self.title_codes = array("I", (self.title_codes[row] for row in rows))
+        isbn_data = bytearray()
+        isbn_offsets = array("Q", [0])
+        for row in rows:
+            isbn_data += self._isbn_data[self._isbn_offsets[row]:self._isbn_offsets[row + 1]]
+            isbn_offsets.append(len(isbn_data))
+        self._isbn_data = isbn_data
+        self._isbn_offsets = isbn_offsets
+        self._alive = bytearray(b"\x01" * len(rows))
+        self._rows = {
+            self._isbn_data[isbn_offsets[i]:isbn_offsets[i + 1]].decode(): i
+            for i in range(len(rows))
+        }
+
+
+class ColumnIndexDict(IndexDict):
+    """
+    Индекс Library поверх BookStore. Записи по ключам те же, что
+    в IndexDict: поиск по году и жанру не просматривает колонки.
+    Колоночные фильтры хранилища (rows_with_year, rows_with_genre,
+    rows_in_year_range) остаются для запросов, которым индекс не нужен.
+    Хранилище создаёт новый объект Book при каждом чтении, поэтому
+    индекс сопоставляет строки хранилища проиндексированным книгам.
+    """
+
+    def __init__(self, store: BookStore) -> None:
+        super().__init__()
+        self.store = store
+
+    def remove(self, book: Book) -> None:
+        # Удаляется проиндексированная книга с тем же ISBN.
+        super().remove(self.isbn_index.get(book.isbn, book))
+
+    def books_at(self, rows: Iterable[int]) -> Iterator[Book]:
+        """
+        Проиндексированные книги для строк хранилища. Для строк, ещё
+        не попавших в индекс (например, внутри deferred_index), создаются
+        новые книги.
+        """
+        store, isbn_index = self.store, self.isbn_index
+        for row in rows:
+            book = isbn_index.get(store.isbn_at(row))
+            yield book if book is not None else store._materialize(row)
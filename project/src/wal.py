@@ -0,0 +1,221 @@
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+
+from .book import Book, Library
+
+ADD = 1
+REMOVE = 2
+
+SYNC_POLICIES = ("always", "batch", "never")
+
+_RECORD = struct.Struct("<IIB")
+_FIELD = struct.Struct("<I")
+_YEAR = struct.Struct("<i")
+
+
+def _pack_string(value: str) -> bytes:
+    data = value.encode()
+    return _FIELD.pack(len(data)) + data
+
+
+def _unpack_string(payload: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _FIELD.unpack_from(payload, offset)
+    offset += _FIELD.size
+    return payload[offset:offset + length].decode(), offset + length
+
+
+class WriteAheadLog:
+    """
+    Журнал упреждающей записи для add/remove. Записи копятся в буфере
+    и сбрасываются группой (group commit) каждые batch_size записей,
+    но не позже чем через max_delay секунд после первой записи группы:
+    в тихие периоды её сбрасывает таймер. При max_delay=None группа
+    ждёт только batch_size.
+    Политика sync: "always" — сброс и fsync на каждую запись,
+    "batch" — fsync при сбросе группы, "never" — без fsync.
+    Каждая запись снабжена длиной и CRC32, поэтому недописанный
+    хвост после сбоя отбрасывается при восстановлении.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        sync: str = "batch",
+        batch_size: int = 64,
+        max_delay: float | None = 1.0,
+    ) -> None:
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Неизвестная политика sync: {sync}")
+        self.path = path
+        self.sync = sync
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._file = open(path, "ab")
+        self._buffer = bytearray()
+        self._pending = 0
+        # Таймер сбрасывает группу из своего потока, поэтому буфер
+        # и файл меняются только под этой блокировкой.
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def log_add(self, book: Book) -> None:
+        payload = b"".join((
+            _pack_string(book.title),
+            _pack_string(book.author),
+            _YEAR.pack(book.year),
+            _pack_string(book.genre),
+            _pack_string(book.isbn),
+        ))
+        self._append(ADD, payload)
+
+    def log_remove(self, isbn: str) -> None:
+        self._append(REMOVE, _pack_string(isbn))
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def truncate(self) -> None:
+        """Очищает журнал, например после записи нового снимка."""
+        with self._lock:
+            self._cancel_timer()
+            self._buffer.clear()
+            self._pending = 0
+            self._file.truncate(0)
+            self._file.flush()
+            if self.sync != "never":
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+
+    def __enter__(self) -> "WriteAheadLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _append(self, operation: int, payload: bytes) -> None:
+        with self._lock:
+            self._buffer += _RECORD.pack(len(payload), zlib.crc32(payload), operation)
+            self._buffer += payload
+            self._pending += 1
+            if self.sync == "always" or self._pending >= self.batch_size:
+                self._flush()
+            elif self._pending == 1 and self.max_delay is not None:
+                self._timer = threading.Timer(self.max_delay, self._flush_expired)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self) -> None:
+        self._cancel_timer()
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        if self.sync != "never":
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def _flush_expired(self) -> None:
+        with self._lock:
+            # Журнал могли закрыть, пока таймер ждал блокировку.
+            if not self._file.closed and self._pending:
+                self._flush()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+class WalReader:
+    """
+    Итератор по записям журнала: (ADD, Book) или (REMOVE, isbn).
+    Чтение останавливается на первой повреждённой или недописанной записи;
+    после обхода offset — конец последней целой записи.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = path
+        self.offset = 0
+
+    def __iter__(self) -> Iterator[tuple[int, Book | str]]:
+        self.offset = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            data = file.read()
+        while self.offset + _RECORD.size <= len(data):
+            length, checksum, operation = _RECORD.unpack_from(data, self.offset)
+            start = self.offset + _RECORD.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != checksum:
+                return
+            if operation == ADD:
+                title, position = _unpack_string(payload, 0)
+                author, position = _unpack_string(payload, position)
+                (year,) = _YEAR.unpack_from(payload, position)
+                genre, position = _unpack_string(payload, position + _YEAR.size)
+                isbn, _ = _unpack_string(payload, position)
+                record: tuple[int, Book | str] = (ADD, Book(title, author, year, genre, isbn))
+            elif operation == REMOVE:
+                isbn, _ = _unpack_string(payload, 0)
+                record = (REMOVE, isbn)
+            else:
+                return
+            self.offset = start + length
+            yield record
+
+
+def replay(path: str | os.PathLike) -> WalReader:
+    """Читает записи журнала: (ADD, Book) или (REMOVE, isbn). См. WalReader."""
+    return WalReader(path)
+
+
+def recover(
+    snapshot_path: str | os.PathLike,
+    wal_path: str | os.PathLike,
+    sync: str = "batch",
+    batch_size: int = 64,
+    max_delay: float | None = 1.0,
+) -> Library:
+    """
+    Восстанавливает библиотеку: загружает последний снимок через
+    Library.load (если он есть), применяет поверх него записи журнала
+    через add_book/remove_book и подключает журнал для новых записей.
+    Недописанный хвост журнала обрезается, иначе новые записи оказались бы
+    за ним и были бы потеряны при следующем восстановлении.
+    """
+    library = Library.load(snapshot_path) if os.path.exists(snapshot_path) else Library()
+    records = replay(wal_path)
+    for _, value in records:
+        isbn = value.isbn if isinstance(value, Book) else value
+        existing = library.search_by_isbn(isbn)
+        if existing is not None:
+            library.remove_book(existing)
+        if isinstance(value, Book):
+            library.add_book(value)
+    if os.path.exists(wal_path) and os.path.getsize(wal_path) > records.offset:
+        os.truncate(wal_path, records.offset)
+    library.wal = WriteAheadLog(wal_path, sync, batch_size, max_delay)
+    return library
+
+
+def compact(library: Library, snapshot_path: str | os.PathLike) -> None:
+    """
+    Сворачивает журнал в новый снимок: снимок атомарно заменяется,
+    после чего журнал очищается. Если сбой произойдёт между этими шагами,
+    повторное применение журнала к новому снимку даст то же состояние.
+    """
+    if library.wal is not None:
+        library.wal.flush()
+    library.save(snapshot_path)
+    if library.wal is not None:
+        library.wal.truncate()
@@ -0,0 +1,163 @@
+import json
+import os
+import random
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+
+from .book import Library
+from .simulation import (
+    AUTHORS,
+    EVENTS,
+    Emit,
+    generate_random_isbn,
+)
+
+# События, которые добавляет профиль нагрузки к базовым событиям симуляции.
+PROFILE_EVENTS = ("search_isbn", "rebuild_index")
+EVENT_NAMES = tuple(name for name, _ in EVENTS) + PROFILE_EVENTS
+
+
+def zipf_index(size: int, skew: float, rng: random.Random | None = None) -> int:
+    """
+    Случайная позиция из range(size) с убывающей по закону Ципфа
+    популярностью: позиция 0 — самая частая. При skew = 0 распределение
+    равномерное. Используется обратная функция непрерывного приближения,
+    поэтому выбор стоит O(1) при любом size.
+    """
+    randrange, uniform = (rng.randrange, rng.random) if rng is not None else (random.randrange, random.random)
+    if skew <= 0:
+        return randrange(size)
+    u = uniform()
+    if skew == 1:
+        x = (size + 1) ** u
+    else:
+        x = (((size + 1) ** (1 - skew) - 1) * u + 1) ** (1 / (1 - skew))
+    return min(int(x) - 1, size - 1)
+
+
+@dataclass
+class WorkloadProfile:
+    """
+    Профиль нагрузки для симуляции: веса событий, популярность ключей
+    (показатель Ципфа для авторов и для книг при поиске по ISBN), доля
+    поисков по ISBN, которые находят книгу, и размер начального каталога.
+    """
+
+    name: str
+    weights: dict[str, float]
+    author_skew: float = 0.0
+    isbn_skew: float = 0.0
+    isbn_hit_ratio: float = 0.0
+    warmup: int = 0
+    description: str = field(default="", compare=False)
+
+    def __post_init__(self) -> None:
+        unknown = set(self.weights) - set(EVENT_NAMES)
+        if unknown:
+            raise ValueError(f"Неизвестные события: {', '.join(sorted(unknown))}")
+        if not 0 <= self.isbn_hit_ratio <= 1:
+            raise ValueError("Доля попаданий по ISBN должна быть от 0 до 1")
+        if self.warmup < 0:
+            raise ValueError("Размер начального каталога не может быть отрицательным")
+
+    def events(self) -> list[tuple[str, Callable[[Library, Emit | None], None]]]:
+        """События симуляции с учётом профиля: поиск автора и ISBN учитывают популярность."""
+        replaced = {"search_author": self.event_search_by_author}
+        events = [(name, replaced.get(name, func)) for name, func in EVENTS]
+        events.append(("search_isbn", self.event_search_by_isbn))
+        events.append(("rebuild_index", event_rebuild_index))
+        return events
+
+    def event_search_by_author(self, library: Library, emit: Emit | None = print) -> None:
+        author = AUTHORS[zipf_index(len(AUTHORS), self.author_skew)]
+        results = library.search_by_author(author)
+        if emit is not None:
+            emit(f"Поиск по автору '{author}': найдено {len(results)} книг")
+
+    def event_search_by_isbn(self, library: Library, emit: Emit | None = print) -> None:
+        books = library.book_collection
+        if len(books) and random.random() < self.isbn_hit_ratio:
+            # Слот выбирается за O(1); пустые слоты пропускаются повторным выбором.
+            isbn = books.random_book(lambda size: zipf_index(size, self.isbn_skew)).isbn
+        else:
+            isbn = generate_random_isbn()
+        book = library.search_by_isbn(isbn)
+        if emit is not None:
+            emit(f"Поиск по ISBN {isbn}: {'найдена' if book is not None else 'не найдена'}")
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def event_rebuild_index(library: Library, emit: Emit | None = print) -> None:
+    library.update_index(full=True)
+    if emit is not None:
+        emit(f"Индекс перестроен. Всего книг в индексе: {len(library.index_dict)}")
+
+
+PRESETS = {
+    "read-heavy": WorkloadProfile(
+        "read-heavy",
+        {
+            "search_isbn": 60,
+            "search_author": 20,
+            "search_year": 10,
+            "search_genre": 5,
+            "add_book": 3,
+            "remove_book": 2,
+        },
+        author_skew=1.1,
+        isbn_skew=1.0,
+        isbn_hit_ratio=0.9,
+        warmup=10_000,
+        description="около 95% поисков, популярные книги и авторы",
+    ),
+    "write-heavy": WorkloadProfile(
+        "write-heavy",
+        {
+            "add_book": 45,
+            "remove_book": 35,
+            "search_isbn": 10,
+            "search_author": 10,
+        },
+        isbn_hit_ratio=0.5,
+        warmup=1_000,
+        description="в основном добавление и удаление книг",
+    ),
+    "reindex-storm": WorkloadProfile(
+        "reindex-storm",
+        {
+            "update_index": 20,
+            "rebuild_index": 20,
+            "add_book": 25,
+            "remove_book": 15,
+            "search_isbn": 10,
+            "search_author": 10,
+        },
+        isbn_hit_ratio=0.5,
+        warmup=5_000,
+        description="частые обновления и полные перестроения индекса",
+    ),
+}
+
+
+def load_profile(path: str | os.PathLike) -> WorkloadProfile:
+    """Загружает профиль из JSON-файла с полями WorkloadProfile."""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    if not isinstance(data, dict) or "weights" not in data:
+        raise ValueError(f"Файл {path} не содержит профиль нагрузки")
+    data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    try:
+        return WorkloadProfile(**data)
+    except TypeError as error:
+        raise ValueError(f"Неверный профиль в файле {path}: {error}") from None
+
+
+def get_profile(name: str) -> WorkloadProfile:
+    """Встроенный профиль по имени или профиль из файла по пути."""
+    if name in PRESETS:
+        return PRESETS[name]
+    if os.path.exists(name):
+        return load_profile(name)
+    raise ValueError(f"Неизвестный профиль {name!r}, встроенные: {', '.join(PRESETS)}")
@@ -0,0 +1,39 @@
+import sys
+from operator import attrgetter
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.book import Book
+
+
+@pytest.fixture
+def books() -> list[Book]:
+    """Четыре книги: автор и год повторяются, ISBN идут не по порядку, в названии есть запятая."""
+    return [
+        Book("Война и мир", "Лев Толстой", 1869, "Роман", "978-0000000-000-3"),
+        Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "978-0000000-000-1"),
+        Book("Нос, повесть", "Николай Гоголь", 1836, "Повесть", "978-0000000-000-4"),
+        Book("Анна Каренина", "Лев Толстой", 1877, "Роман", "978-0000000-000-2"),
+    ]
+
+
+@pytest.fixture
+def make_books():
+    """Фабрика make_books(count): книги "isbn-0".. с тремя авторами, четырьмя годами и двумя жанрами."""
+    def make(count: int) -> list[Book]:
+        return [
+            Book(f"Книга {i}", f"Автор {i % 3}", 2000 + i % 4, f"Жанр {i % 2}", f"isbn-{i}")
+            for i in range(count)
+        ]
+    
+    return make
+
+
+@pytest.fixture
+def fields():
+    """Поля книги кортежем: для сравнения копий, созданных хранилищем или снимком."""
+    return attrgetter("title", "author", "year", "genre", "isbn")
@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import asyncio
+import threading
+
+from src.aio import AsyncLibrary
+from src.book import BookView
+from src.concurrency import ThreadSafeLibrary
+
+
+def test_async_library_add_search_remove(make_books):
+    """Тест асинхронного добавления, поиска и удаления."""
+    async def scenario():
+        library = AsyncLibrary()
+        books = make_books(10)
+        await library.add_books(books)
+        await library.update_index(full=True)
+        
+        assert await library.search_by_isbn("isbn-3") is books[3]
+        results = await library.search_by_author("Автор 0")
+        assert isinstance(results, BookView)
+        assert list(results) == [books[0], books[3], books[6], books[9]]
+        assert len(await library.search_by_year_range(2000, 2001)) == 6
+        
+        await library.remove_book(books[3])
+        assert await library.search_by_isbn("isbn-3") is None
+        assert len(await library.search_by_genre("Жанр 1")) == 4
+    
+    asyncio.run(scenario())
+
+
+def test_async_library_add_books_in_chunks(make_books):
+    """Тест массового добавления пакетами."""
+    calls = []
+    
+    class CountingLibrary(ThreadSafeLibrary):
+        def add_books(self, books):
+            calls.append(len(books))
+            super().add_books(books)
+    
+    async def scenario():
+        library = AsyncLibrary(CountingLibrary(), chunk_size=4)
+        await library.add_books(make_books(10))
+        return library
+    
+    library = asyncio.run(scenario())
+    
+    assert calls == [4, 4, 2]
+    assert len(library.library.book_collection) == 10
+
+
+def test_async_library_coalesces_duplicate_queries(make_books):
+    """Тест объединения одинаковых одновременных поисков."""
+    release = threading.Event()
+    calls = []
+    
+    class SlowLibrary(ThreadSafeLibrary):
+        def search_by_author(self, author):
+            calls.append(author)
+            release.wait(5)
+            return super().search_by_author(author)
+    
+    async def scenario():
+        library = AsyncLibrary(SlowLibrary())
+        await library.add_books(make_books(6))
+        tasks = [asyncio.create_task(library.search_by_author("Автор 1")) for _ in range(5)]
+        tasks.append(asyncio.create_task(library.search_by_author("Автор 2")))
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert all(results[0] is result for result in results[:5])
+        assert len(results[5]) == 2
+        assert library._inflight == {}
+    
+    asyncio.run(scenario())
+    
+    assert sorted(calls) == ["Автор 1", "Автор 2"]
+
+
+def test_async_library_iterate(make_books):
+    """Тест асинхронного обхода большого результата."""
+    async def scenario():
+        library = AsyncLibrary(chunk_size=7)
+        books = make_books(30)
+        await library.add_books(books)
+        found = [book async for book in library.iterate("search_by_genre", "Жанр 0")]
+        single = [book async for book in library.iterate("search_by_isbn", "isbn-5")]
+        missing = [book async for book in library.iterate("search_by_isbn", "нет")]
+        return books, found, single, missing
+    
+    books, found, single, missing = asyncio.run(scenario())
+    
+    assert found == books[::2]
+    assert single == [books[5]]
+    assert missing == []
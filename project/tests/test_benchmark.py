@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+
+import pytest
+
+from src.benchmark import BenchmarkResult, compare, count_matches, main, measure, percentile, run
+from src.book import Book, Library
+
+
+def test_percentile():
+    """Тест вычисления процентилей методом ближайшего ранга."""
+    values = list(range(1, 101))
+    
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_measure_counts_calls_and_memory():
+    """Тест замера серии вызовов с пиковой памятью."""
+    calls = [lambda: bytearray(100_000) for _ in range(5)]
+    
+    result = measure(10, "alloc", calls, memory=True)
+    
+    assert isinstance(result, BenchmarkResult)
+    assert result.ops == 5
+    assert result.p50_us <= result.p99_us
+    assert result.peak_kib >= 90
+    assert result.ops_per_second > 0
+
+
+def test_count_matches_walks_lazy_view():
+    """Тест подсчёта книг, найденных ленивым поиском."""
+    library = Library()
+    library.add_books([
+        Book("Война и мир", "Толстой", 1869, "Роман", "1"),
+        Book("Анна Каренина", "Толстой", 1877, "Роман", "2"),
+        Book("Вишнёвый сад", "Чехов", 1904, "Пьеса", "3"),
+    ])
+    
+    assert count_matches(library.search_by_author, "Толстой") == 2
+    assert count_matches(library.search_by_genre, "Пьеса") == 1
+    assert count_matches(library.search_by_year, 2000) == 0
+
+
+def test_run_is_reproducible():
+    """Тест состава отчёта и воспроизводимости набора операций."""
+    first = run(sizes=[50], ops=10, seed=1)
+    second = run(sizes=[50], ops=10, seed=1)
+    
+    operations = [row["operation"] for row in first["results"]]
+    assert operations == [row["operation"] for row in second["results"]]
+    assert "search_by_isbn" in operations
+    assert "update_index_full" in operations
+    assert all(row["size"] == 50 for row in first["results"])
+    assert first["meta"]["seed"] == 1
+
+
+def test_run_repeats_bulk_operations():
+    """Тест повторов пакетных операций и скорости в книгах в секунду."""
+    report = run(sizes=[40], ops=5, seed=1, repeat=3)
+    rows = {row["operation"]: row for row in report["results"]}
+    
+    for operation in ("add_books", "update_index_full"):
+        assert rows[operation]["ops"] == 3
+        assert rows[operation]["books_per_call"] == 40
+        assert rows[operation]["books_per_second"] == pytest.approx(rows[operation]["ops_per_second"] * 40)
+    assert rows["add_book"]["ops"] == 5
+    assert rows["add_book"]["books_per_second"] == rows["add_book"]["ops_per_second"]
+
+
+def test_compare_flags_regressions():
+    """Тест обнаружения регрессий при сравнении прогонов."""
+    baseline = {"results": [
+        {"size": 10, "operation": "add_book", "ops_per_second": 1000.0},
+        {"size": 10, "operation": "search_by_isbn", "ops_per_second": 1000.0},
+    ]}
+    current = {"results": [
+        {"size": 10, "operation": "add_book", "ops_per_second": 950.0},
+        {"size": 10, "operation": "search_by_isbn", "ops_per_second": 500.0},
+        {"size": 20, "operation": "add_book", "ops_per_second": 1.0},
+    ]}
+    
+    regressions = compare(baseline, current, threshold=0.1)
+    
+    assert len(regressions) == 1
+    assert regressions[0].startswith("search_by_isbn (n=10)")
+
+
+def test_main_writes_json(tmp_path, capsys):
+    """Тест записи результатов в JSON и сравнения с прошлым прогоном."""
+    output = tmp_path / "bench.json"
+    
+    assert main(["--sizes", "20", "--ops", "5", "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert {row["operation"] for row in report["results"]} >= {"add_book", "remove_book"}
+    
+    for row in report["results"]:
+        row["ops_per_second"] *= 1000
+    output.write_text(json.dumps(report), encoding="utf-8")
+    assert main(["--sizes", "20", "--ops", "5", "--compare", str(output)]) == 1
+    assert "Регрессия" in capsys.readouterr().out
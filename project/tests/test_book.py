@@ -5,10 +5,42 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import tracemalloc
+
 import pytest
 from src.book import Book
 
 
+class _DictBook:
+    """Книга в прежнем представлении: обычный класс с __dict__ без интернирования."""
+
+    def __init__(self, title, author, year, genre, isbn):
+        self.title = title
+        self.author = author
+        self.year = year
+        self.genre = genre
+        self.isbn = isbn
+
+
+def _bytes_per_book(factory, count: int = 2000) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    books = [
+        factory(
+            "".join(["Война ", "и мир"]),
+            "".join(["Лев ", "Толстой"]),
+            1869,
+            "".join(["Исторический ", "роман"]),
+            f"978-{i:07d}-123-4",
+        )
+        for i in range(count)
+    ]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(books) == count
+    return (after - before) / count
+
+
 def test_book_creation():
     """Тест создания книги с корректными параметрами."""
     book = Book(
@@ -67,3 +99,61 @@ def test_book_different_books():
     assert book1.genre != book2.genre
     assert book1.isbn != book2.isbn
 
+
+
+def test_book_has_no_instance_dict():
+    """Тест компактного представления книги через __slots__."""
+    book = Book("Тест", "Автор", 2000, "Жанр", "123-4567890-123-4")
+    
+    assert not hasattr(book, "__dict__")
+    with pytest.raises(AttributeError):
+        book.publisher = "Издательство"
+
+
+def test_book_interns_categorical_fields():
+    """Тест разделения одинаковых строк автора, жанра и названия."""
+    book1 = Book(
+        title="".join(["Иди", "от"]),
+        author="".join(["Фёдор ", "Достоевский"]),
+        year=1869,
+        genre="".join(["Ро", "ман"]),
+        isbn="111-1111111-111-1",
+    )
+    book2 = Book(
+        title="".join(["Ид", "иот"]),
+        author="".join(["Фёдор Дос", "тоевский"]),
+        year=1869,
+        genre="".join(["Р", "оман"]),
+        isbn="222-2222222-222-2",
+    )
+    
+    assert book1.title is book2.title
+    assert book1.author is book2.author
+    assert book1.genre is book2.genre
+
+
+def test_book_memory_per_instance():
+    """Тест объёма памяти на книгу до и после перехода на __slots__ и интернирование."""
+    before = _bytes_per_book(_DictBook)
+    after = _bytes_per_book(Book)
+    
+    print(f"Байт на книгу: было {before:.0f}, стало {after:.0f}")
+    assert after < before * 0.75
+
+
+def test_book_field_assignment():
+    """Тест изменения полей книги вне библиотеки."""
+    book = Book("Тест", "Автор", 2000, "Жанр", "123-4567890-123-4")
+    
+    book.title = "".join(["Нов", "ое название"])
+    book.year = 2001
+    
+    assert book.title == "Новое название"
+    assert book.title is sys.intern("Новое название")
+    assert book.year == 2001
+
+
+def test_book_fields_are_plain_slots():
+    """Тест чтения полей книги напрямую из слотов, без дескрипторов на Python."""
+    for field in ("title", "author", "year", "genre", "isbn"):
+        assert type(Book.__dict__[field]).__name__ == "member_descriptor"
@@ -123,3 +123,88 @@ def test_book_collection_index_out_of_range():
     with pytest.raises(IndexError):
         _ = collection[0]
 
+
+
+def test_book_collection_remove_keeps_order():
+    """Тест сохранения порядка и индексации после удаления из середины."""
+    collection = BookCollection()
+    books = [
+        Book(f"Книга {i}", "Автор", 2000, "Жанр", f"111-1111111-111-{i}")
+        for i in range(5)
+    ]
+    for book in books:
+        collection.add(book)
+    
+    collection.remove(books[1])
+    collection.remove(books[3])
+    
+    assert len(collection) == 3
+    assert list(collection) == [books[0], books[2], books[4]]
+    assert collection[1] == books[2]
+    assert collection[-1] == books[4]
+    assert books[1] not in collection
+
+
+def test_book_collection_remove_many():
+    """Тест массового удаления с уплотнением слотов."""
+    collection = BookCollection()
+    books = [
+        Book(f"Книга {i}", "Автор", 2000, "Жанр", f"111-1111111-111-{i}")
+        for i in range(100)
+    ]
+    for book in books:
+        collection.add(book)
+    
+    for book in books[:90]:
+        collection.remove(book)
+    
+    assert len(collection) == 10
+    assert list(collection) == books[90:]
+    assert collection[0:2] == books[90:92]
+
+
+def test_book_collection_add_duplicate():
+    """Тест повторного добавления той же книги (должна быть ошибка)."""
+    collection = BookCollection()
+    book = Book("Тест", "Автор", 2000, "Жанр", "123-4567890-123-4")
+    
+    collection.add(book)
+    
+    with pytest.raises(ValueError):
+        collection.add(book)
+
+
+def test_book_collection_extend():
+    """Тест пакетного добавления книг в коллекцию."""
+    collection = BookCollection()
+    book1 = Book("Книга 1", "Автор 1", 2000, "Жанр 1", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор 2", 2010, "Жанр 2", "222-2222222-222-2")
+    
+    collection.add(book1)
+    collection.extend([book2])
+    
+    assert list(collection) == [book1, book2]
+    with pytest.raises(ValueError):
+        collection.extend([book1])
+    assert len(collection) == 2
+
+
+def test_book_collection_random_book_skips_removed():
+    """Тест случайного выбора книги без уплотнения и без удалённых книг."""
+    collection = BookCollection()
+    books = [
+        Book(f"Книга {i}", "Автор", 2000, "Жанр", f"111-1111111-111-{i}")
+        for i in range(10)
+    ]
+    for book in books:
+        collection.add(book)
+    for book in books[:4]:
+        collection.remove(book)
+    
+    picked = {collection.random_book() for _ in range(200)}
+    
+    assert picked == set(books[4:])
+    assert collection[0] == books[4]
+    assert len(collection._slots) == 10
+    with pytest.raises(IndexError):
+        BookCollection().random_book()
@@ -0,0 +1,231 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import random
+import threading
+
+from src.book import Book, BookCollection, BookView
+from src.concurrency import ReadWriteLock, ThreadSafeLibrary
+from src.store import BookStore
+
+
+def test_read_write_lock_allows_concurrent_readers():
+    """Тест одновременного чтения несколькими потоками."""
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+    
+    def reader():
+        with lock.read():
+            inside.wait()
+    
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not inside.broken
+
+
+def test_read_write_lock_writer_is_exclusive():
+    """Тест монопольного доступа писателя."""
+    lock = ReadWriteLock()
+    events = []
+    writer_inside = threading.Event()
+    
+    def writer():
+        with lock.write():
+            writer_inside.set()
+            events.append("write-start")
+            threading.Event().wait(0.05)
+            events.append("write-end")
+    
+    def reader():
+        writer_inside.wait()
+        with lock.read():
+            events.append("read")
+    
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert events == ["write-start", "write-end", "read"]
+
+
+def test_thread_safe_library_search_returns_copy():
+    """Тест копирования результата поиска под блокировкой."""
+    library = ThreadSafeLibrary()
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2000, "Жанр", "222-2222222-222-2")
+    library.add_book(book1)
+    library.add_book(book2)
+    
+    results = library.search_by_author("Автор")
+    library.remove_book(book1)
+    
+    assert isinstance(results, BookView)
+    assert list(results) == [book1, book2]
+    assert len(library.search_by_author("Автор")) == 1
+    assert len(library.query(author="Автор", genre="Жанр")) == 1
+
+
+def test_thread_safe_library_stress():
+    """Стресс-тест: смешанная нагрузка из многих потоков."""
+    library = ThreadSafeLibrary()
+    authors = [f"Автор {i}" for i in range(5)]
+    errors = []
+    
+    def writer(seed):
+        rng = random.Random(seed)
+        added = []
+        for i in range(200):
+            if added and rng.random() < 0.3:
+                library.remove_book(added.pop(rng.randrange(len(added))))
+            else:
+                book = Book(
+                    f"Книга {i}",
+                    rng.choice(authors),
+                    1900 + rng.randrange(50),
+                    "Жанр",
+                    f"{seed}-{i}",
+                )
+                library.add_book(book)
+                added.append(book)
+            if i % 50 == 0:
+                library.update_index()
+    
+    def reader(seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            author = rng.choice(authors)
+            results = library.search_by_author(author)
+            if any(book.author != author for book in results):
+                errors.append("чужой автор в результате")
+            for book in results:
+                if library.search_by_isbn(book.isbn) not in (None, book):
+                    errors.append("ISBN указывает на другую книгу")
+            with library.lock.read():
+                if len(library.book_collection) != len(library.index_dict):
+                    errors.append("коллекция и индекс разошлись")
+    
+    threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+    threads += [threading.Thread(target=reader, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert len(library.book_collection) == len(library.index_dict)
+    assert sum(len(library.search_by_author(author)) for author in authors) == len(library.book_collection)
+
+
+def test_thread_safe_library_rebuild_does_not_block_readers():
+    """Тест перестроения индекса без блокировки читателей и писателей."""
+    started = threading.Event()
+    release = threading.Event()
+    
+    class SlowLibrary(ThreadSafeLibrary):
+        def _build_index(self, books, workers=1):
+            if self.version:
+                started.set()
+                assert release.wait(5)
+            return super()._build_index(books, workers)
+    
+    library = SlowLibrary()
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2001, "Жанр", "222-2222222-222-2")
+    library.add_book(book1)
+    library.add_book(book2)
+    old_index = library.index_dict
+    
+    rebuild = threading.Thread(target=library.update_index, kwargs={"full": True})
+    rebuild.start()
+    assert started.wait(5)
+    
+    assert list(library.search_by_author("Автор")) == [book1, book2]
+    book3 = Book("Книга 3", "Автор", 2002, "Жанр", "333-3333333-333-3")
+    library.add_book(book3)
+    library.remove_book(book1)
+    book2.year = 1999
+    assert list(library.search_by_author("Автор")) == [book2, book3]
+    
+    release.set()
+    rebuild.join()
+    
+    assert library.version == 2
+    assert library.index_dict is not old_index
+    assert set(library.search_by_author("Автор")) == {book2, book3}
+    assert library.search_by_isbn(book1.isbn) is None
+    assert list(library.search_by_year(1999)) == [book2]
+    assert len(library.search_by_year(2001)) == 0
+
+
+def test_thread_safe_library_pinned_version():
+    """Тест закрепления версии индекса на время нескольких запросов."""
+    library = ThreadSafeLibrary()
+    library.add_book(Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1"))
+    
+    with library.pinned() as index:
+        assert index is library.index_dict
+        assert index.isbn_index["111-1111111-111-1"].title == "Книга"
+        assert len(index.author_index["Автор"]) == 1
+
+
+def test_thread_safe_library_field_edit_is_atomic():
+    """Тест правки поля: слот и перенос в индексе под одной блокировкой записи."""
+    library = ThreadSafeLibrary()
+    book = Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    library.add_book(book)
+    observed = []
+    update = library.book_collection.update
+    move = library.index_dict.move
+    
+    def checked_update(updated, field, value):
+        observed.append(("update", library.lock._writer, updated.year))
+        update(updated, field, value)
+    
+    def checked_move(moved, field, old_value):
+        observed.append(("move", library.lock._writer, moved.year))
+        move(moved, field, old_value)
+    
+    library.book_collection.update = checked_update
+    library.index_dict.move = checked_move
+    book.year = 2001
+    
+    assert observed == [("update", True, 2000), ("move", True, 2001)]
+    assert list(library.search_by_year(2001)) == [book]
+    assert len(library.search_by_year(2000)) == 0
+
+
+def test_thread_safe_library_owns_books_after_full_rebuild():
+    """Тест владения книгами после полного перестроения: правки попадают в индекс."""
+    collection = BookCollection()
+    book = Book("Книга", "A", 2000, "Жанр", "111-1111111-111-1")
+    collection.add(book)
+    library = ThreadSafeLibrary(collection)
+    
+    book.author = "B"
+    
+    assert list(library.search_by_author("B")) == [book]
+    assert len(library.search_by_author("A")) == 0
+
+
+def test_thread_safe_library_store_edit_after_full_rebuild():
+    """Тест правки книги из поиска по хранилищу после полного перестроения."""
+    library = ThreadSafeLibrary(BookStore())
+    library.add_book(Book("Книга", "A", 2000, "Жанр", "111-1111111-111-1"))
+    library.update_index(full=True)
+    
+    found = library.search_by_isbn("111-1111111-111-1")
+    found.author = "B"
+    
+    assert [book.isbn for book in library.search_by_author("B")] == ["111-1111111-111-1"]
+    assert len(library.search_by_author("A")) == 0
+    assert [book.author for book in library.book_collection] == ["B"]
@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.book import Library
+from src.feed import (
+    export_csv,
+    export_jsonl,
+    import_books,
+    import_csv,
+    import_jsonl,
+    iter_csv,
+    parse_book,
+)
+
+
+def test_parse_book(fields):
+    """Тест разбора записи в книгу."""
+    book = parse_book({
+        "title": "Идиот",
+        "author": "Фёдор Достоевский",
+        "year": "1869",
+        "genre": "Роман",
+        "isbn": "1",
+    })
+    
+    assert fields(book) == ("Идиот", "Фёдор Достоевский", 1869, "Роман", "1")
+
+
+def test_parse_book_invalid():
+    """Тест разбора некорректных записей (должна быть ошибка)."""
+    with pytest.raises(ValueError):
+        parse_book({"title": "Идиот"})
+    with pytest.raises(ValueError):
+        parse_book({"title": "Идиот", "author": "А", "year": "давно", "genre": "Роман", "isbn": "1"})
+
+
+def test_csv_roundtrip(tmp_path, books, fields):
+    """Тест экспорта и импорта CSV."""
+    path = tmp_path / "books.csv"
+    
+    assert export_csv(books, path) == 4
+    library = Library()
+    report = import_csv(library, path, chunk_size=2)
+    
+    assert report.rows == 4
+    assert report.rejected == 0
+    assert [fields(book) for book in library.book_collection] == [fields(book) for book in books]
+    assert len(library.search_by_year(1869)) == 2
+
+
+def test_jsonl_roundtrip(tmp_path, books, fields):
+    """Тест экспорта и импорта JSON Lines."""
+    path = tmp_path / "books.jsonl"
+    
+    assert export_jsonl(books, path) == 4
+    library = Library()
+    report = import_jsonl(library, path)
+    
+    assert report.rows == 4
+    assert [fields(book) for book in library.book_collection] == [fields(book) for book in books]
+
+
+def test_import_reports_rejected_rows(tmp_path):
+    """Тест учёта отклонённых строк: ошибки разбора и повторные ISBN."""
+    path = tmp_path / "books.jsonl"
+    path.write_text(
+        '{"title": "Идиот", "author": "Фёдор Достоевский", "year": 1869, "genre": "Роман", "isbn": "1"}\n'
+        "{не json}\n"
+        '{"title": "Нос", "author": "Николай Гоголь", "year": "?", "genre": "Повесть", "isbn": "2"}\n'
+        '{"title": "Идиот", "author": "Фёдор Достоевский", "year": 1869, "genre": "Роман", "isbn": "1"}\n'
+        "\n"
+        "[1, 2]\n",
+        encoding="utf-8",
+    )
+    library = Library()
+    
+    report = import_jsonl(library, path, chunk_size=2)
+    
+    assert report.rows == 1
+    assert report.rejected == 4
+    assert [number for number, _ in report.errors] == [2, 3, 4, 5]
+    assert report.rows_per_second > 0
+
+
+def test_import_books_streams_in_chunks():
+    """Тест потокового импорта: записи читаются не раньше, чем нужен пакет."""
+    consumed = []
+    
+    def records():
+        for i in range(5):
+            consumed.append(i)
+            yield {"title": f"Книга {i}", "author": "Автор", "year": 2000, "genre": "Жанр", "isbn": str(i)}
+    
+    class RecordingLibrary(Library):
+        def add_books(self, books):
+            books = list(books)
+            batches.append((len(books), len(consumed)))
+            super().add_books(books)
+    
+    batches = []
+    library = RecordingLibrary()
+    report = import_books(library, records(), chunk_size=2)
+    
+    assert report.rows == 5
+    assert batches == [(2, 2), (2, 4), (1, 5)]
+    assert len(library.search_by_author("Автор")) == 5
+
+
+def test_import_books_rejects_duplicates_across_chunks_with_deferred_index():
+    """Тест повторного ISBN в разных пакетах при отложенном обновлении индекса."""
+    records = [
+        {"title": f"Книга {i}", "author": "Автор", "year": 2000, "genre": "Жанр", "isbn": str(i % 3)}
+        for i in range(5)
+    ]
+    library = Library()
+    
+    with library.deferred_index():
+        report = import_books(library, records, chunk_size=2)
+    
+    assert report.rows == 3
+    assert report.rejected == 2
+    assert [number for number, _ in report.errors] == [4, 5]
+    assert len(library.book_collection) == 3
+
+
+def test_iter_csv_is_lazy(tmp_path, books):
+    """Тест ленивого чтения CSV."""
+    path = tmp_path / "books.csv"
+    export_csv(books, path)
+    
+    rows = iter_csv(path)
+    
+    assert next(rows)["title"] == "Война и мир"
+    rows.close()
@@ -16,6 +16,8 @@ def test_index_dict_creation():
     assert len(index.isbn_index) == 0
     assert len(index.author_index) == 0
     assert len(index.year_index) == 0
+    assert len(index.title_index) == 0
+    assert len(index.genre_index) == 0
 
 
 def test_index_dict_add_book():
@@ -29,6 +31,8 @@ def test_index_dict_add_book():
     assert index.isbn_index[book.isbn] == book
     assert book in index.author_index[book.author]
     assert book in index.year_index[book.year]
+    assert book in index.title_index[book.title]
+    assert book in index.genre_index[book.genre]
 
 
 def test_index_dict_add_multiple_books_same_author():
@@ -82,7 +86,7 @@ def test_index_dict_get_by_author():
     index.add(book2)
     
     result = index["Автор"]
-    assert isinstance(result, list)
+    assert isinstance(result, dict)
     assert len(result) == 2
     assert book1 in result
     assert book2 in result
@@ -98,7 +102,7 @@ def test_index_dict_get_by_year():
     index.add(book2)
     
     result = index[2000]
-    assert isinstance(result, list)
+    assert isinstance(result, dict)
     assert len(result) == 2
     assert book1 in result
     assert book2 in result
@@ -161,6 +165,22 @@ def test_index_dict_remove_book_with_multiple_same_author():
     assert book2 in index.author_index["Автор"]
 
 
+def test_index_dict_remove_book_sharing_isbn():
+    """Тест удаления книги, ISBN которой проиндексирован за другой книгой."""
+    index = IndexDict()
+    book1 = Book("Книга 1", "Автор 1", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор 2", 2010, "Жанр", "111-1111111-111-1")
+    
+    index.add(book1)
+    index.add(book2)
+    index.remove(book1)
+    
+    assert index.isbn_index[book2.isbn] is book2
+    assert "Автор 1" not in index.author_index
+    assert book2 in index.author_index["Автор 2"]
+    assert list(index.genre_index["Жанр"]) == [book2]
+
+
 def test_index_dict_remove_last_book_of_author():
     """Тест удаления последней книги автора (ключ должен удалиться)."""
     index = IndexDict()
@@ -183,6 +203,36 @@ def test_index_dict_remove_last_book_of_year():
     assert 2000 not in index.year_index
 
 
+def test_index_dict_add_multiple_books_same_genre():
+    """Тест добавления нескольких книг одного жанра и названия."""
+    index = IndexDict()
+    book1 = Book("Идиот", "Автор 1", 2000, "Роман", "111-1111111-111-1")
+    book2 = Book("Идиот", "Автор 2", 2010, "Роман", "222-2222222-222-2")
+    
+    index.add(book1)
+    index.add(book2)
+    
+    assert list(index.title_index["Идиот"]) == [book1, book2]
+    assert list(index.genre_index["Роман"]) == [book1, book2]
+
+
+def test_index_dict_remove_last_book_of_title_and_genre():
+    """Тест удаления последней книги с названием и жанром (ключи должны удалиться)."""
+    index = IndexDict()
+    book1 = Book("Идиот", "Автор 1", 2000, "Роман", "111-1111111-111-1")
+    book2 = Book("Обломов", "Автор 2", 2010, "Роман", "222-2222222-222-2")
+    
+    index.add(book1)
+    index.add(book2)
+    index.remove(book1)
+    
+    assert "Идиот" not in index.title_index
+    assert list(index.genre_index["Роман"]) == [book2]
+    
+    index.remove(book2)
+    assert "Роман" not in index.genre_index
+
+
 def test_index_dict_remove_nonexistent_book():
     """Тест удаления несуществующей книги (должна быть ошибка)."""
     index = IndexDict()
@@ -206,3 +256,103 @@ def test_index_dict_iteration():
     assert book1 in books_list
     assert book2 in books_list
 
+
+
+def test_index_dict_remove_keeps_order():
+    """Тест сохранения порядка книг автора после удаления из середины."""
+    index = IndexDict()
+    books = [
+        Book(f"Книга {i}", "Автор", 2000, "Жанр", f"111-1111111-111-{i}")
+        for i in range(5)
+    ]
+    for book in books:
+        index.add(book)
+    
+    index.remove(books[2])
+    
+    assert list(index.author_index["Автор"]) == [books[0], books[1], books[3], books[4]]
+    assert list(index.year_index[2000]) == [books[0], books[1], books[3], books[4]]
+
+
+def test_index_dict_sorted_years():
+    """Тест поддержки отсортированного списка годов при добавлении и удалении."""
+    index = IndexDict()
+    book1 = Book("Книга 1", "Автор", 1869, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 1812, "Жанр", "222-2222222-222-2")
+    book3 = Book("Книга 3", "Автор", 1869, "Жанр", "333-3333333-333-3")
+    
+    assert index.min_year() is None
+    assert index.max_year() is None
+    
+    index.add(book1)
+    index.add(book2)
+    index.add(book3)
+    
+    assert index.sorted_years == [1812, 1869]
+    assert index.min_year() == 1812
+    assert index.max_year() == 1869
+    
+    index.remove(book1)
+    assert index.sorted_years == [1812, 1869]
+    
+    index.remove(book3)
+    assert index.sorted_years == [1812]
+
+
+def test_index_dict_years_in_range():
+    """Тест выборки годов и книг из диапазона."""
+    index = IndexDict()
+    books = [
+        Book(f"Книга {year}", "Автор", year, "Жанр", f"111-1111111-{year}-1")
+        for year in (1900, 1840, 1850, 1875, 1901)
+    ]
+    for book in books:
+        index.add(book)
+    
+    assert index.years_in_range(1850, 1900) == [1850, 1875, 1900]
+    assert [book.year for book in index.books_in_range(1850, 1900)] == [1850, 1875, 1900]
+    assert index.years_in_range(1700, 1800) == []
+
+
+def test_index_dict_newest():
+    """Тест выборки самых новых книг."""
+    index = IndexDict()
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2010, "Жанр", "222-2222222-222-2")
+    book3 = Book("Книга 3", "Автор", 2010, "Жанр", "333-3333333-333-3")
+    
+    index.add(book1)
+    index.add(book2)
+    index.add(book3)
+    
+    assert index.newest(2) == [book3, book2]
+    assert index.newest(10) == [book3, book2, book1]
+    assert index.newest(0) == []
+
+
+def test_index_dict_add_many_matches_add():
+    """Тест совпадения пакетного построения индекса с поштучным."""
+    books = [
+        Book(
+            f"Книга {i % 3}",
+            f"Автор {i % 4}",
+            2000 + i % 5,
+            f"Жанр {i % 2}",
+            f"111-1111111-111-{i}",
+        )
+        for i in range(20)
+    ]
+    sequential = IndexDict()
+    for book in books:
+        sequential.add(book)
+    
+    bulk = IndexDict()
+    bulk.add_many(books[:7])
+    bulk.add_many(books[7:])
+    
+    assert bulk.isbn_index == sequential.isbn_index
+    for name in ("author_index", "year_index", "title_index", "genre_index"):
+        expected = {key: list(value) for key, value in getattr(sequential, name).items()}
+        actual = {key: list(value) for key, value in getattr(bulk, name).items()}
+        assert actual == expected
+    assert bulk.sorted_years == sequential.sorted_years
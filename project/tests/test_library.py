@@ -6,7 +6,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import pytest
-from src.book import Book, Library
+from src.book import Book, BookCollection, BookView, ChangeLog, Library
+from src.store import BookStore
 
 
 def test_library_creation():
@@ -88,7 +89,7 @@ def test_library_search_by_author_found():
     results = library.search_by_author("Автор")
     
     assert len(results) == 2
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
     assert book1 in results
     assert book2 in results
     assert book3 not in results
@@ -100,7 +101,7 @@ def test_library_search_by_author_not_found():
     results = library.search_by_author("Несуществующий автор")
     
     assert len(results) == 0
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
 
 
 def test_library_search_by_year_found():
@@ -117,7 +118,7 @@ def test_library_search_by_year_found():
     results = library.search_by_year(2000)
     
     assert len(results) == 2
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
     assert book1 in results
     assert book2 in results
     assert book3 not in results
@@ -129,7 +130,38 @@ def test_library_search_by_year_not_found():
     results = library.search_by_year(1900)
     
     assert len(results) == 0
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
+
+
+def test_library_search_by_year_range():
+    """Тест поиска книг по диапазону годов."""
+    library = Library()
+    book1 = Book("Книга 1", "Автор 1", 1840, "Жанр 1", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор 2", 1869, "Жанр 2", "222-2222222-222-2")
+    book3 = Book("Книга 3", "Автор 3", 1900, "Жанр 3", "333-3333333-333-3")
+    book4 = Book("Книга 4", "Автор 4", 1850, "Жанр 4", "444-4444444-444-4")
+    
+    for book in (book1, book2, book3, book4):
+        library.add_book(book)
+    
+    results = library.search_by_year_range(1850, 1900)
+    
+    assert list(results) == [book4, book2, book3]
+    assert len(library.search_by_year_range(1901, 2000)) == 0
+
+
+def test_library_search_newest():
+    """Тест поиска самых новых книг."""
+    library = Library()
+    book1 = Book("Книга 1", "Автор 1", 1840, "Жанр 1", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор 2", 1869, "Жанр 2", "222-2222222-222-2")
+    book3 = Book("Книга 3", "Автор 3", 1900, "Жанр 3", "333-3333333-333-3")
+    
+    for book in (book1, book2, book3):
+        library.add_book(book)
+    library.remove_book(book3)
+    
+    assert list(library.search_newest(2)) == [book2, book1]
 
 
 def test_library_search_by_title_found():
@@ -146,7 +178,7 @@ def test_library_search_by_title_found():
     results = library.search_by_title("Война и мир")
     
     assert len(results) == 2
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
     assert book1 in results
     assert book2 in results
     assert book3 not in results
@@ -158,7 +190,7 @@ def test_library_search_by_title_not_found():
     results = library.search_by_title("Несуществующая книга")
     
     assert len(results) == 0
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
 
 
 def test_library_search_by_genre_found():
@@ -175,7 +207,7 @@ def test_library_search_by_genre_found():
     results = library.search_by_genre("Роман")
     
     assert len(results) == 2
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
     assert book1 in results
     assert book2 in results
     assert book3 not in results
@@ -187,7 +219,7 @@ def test_library_search_by_genre_not_found():
     results = library.search_by_genre("Несуществующий жанр")
     
     assert len(results) == 0
-    assert isinstance(results, type(library.book_collection))
+    assert isinstance(results, BookView)
 
 
 def test_library_update_index():
@@ -226,6 +258,295 @@ def test_library_update_index_after_manual_modification():
     assert book2.isbn in library.index_dict.isbn_index
 
 
+def test_library_search_by_genre_after_update_index():
+    """Тест поиска по жанру и названию после перестроения индекса."""
+    library = Library()
+    book1 = Book("Идиот", "Автор 1", 2000, "Роман", "111-1111111-111-1")
+    book2 = Book("Обломов", "Автор 2", 2010, "Роман", "222-2222222-222-2")
+    
+    library.add_book(book1)
+    library.add_book(book2)
+    library.book_collection.remove(book1)
+    library.update_index()
+    
+    assert list(library.search_by_genre("Роман")) == [book2]
+    assert len(library.search_by_title("Идиот")) == 0
+
+
+def test_library_add_books():
+    """Тест пакетного добавления книг."""
+    library = Library()
+    books = [
+        Book(f"Книга {i}", f"Автор {i % 2}", 2000 + i, "Жанр", f"111-1111111-111-{i}")
+        for i in range(6)
+    ]
+    
+    library.add_books(iter(books))
+    
+    assert list(library.book_collection) == books
+    assert len(library.index_dict) == 6
+    assert len(library.search_by_author("Автор 0")) == 3
+    assert list(library.search_by_year_range(2002, 2003)) == books[2:4]
+
+
+def test_library_deferred_index():
+    """Тест отложенного построения индекса при крупном импорте."""
+    library = Library()
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2010, "Жанр", "222-2222222-222-2")
+    library.add_book(book1)
+    
+    with library.deferred_index():
+        library.add_book(book2)
+        library.remove_book(book1)
+        assert len(library.book_collection) == 1
+        assert library.search_by_isbn(book2.isbn) is None
+    
+    assert library.search_by_isbn(book1.isbn) is None
+    assert library.search_by_isbn(book2.isbn) == book2
+    assert list(library.search_by_author("Автор")) == [book2]
+
+
+def test_library_deferred_index_nested():
+    """Тест вложенных блоков отложенного индекса: перестроение один раз в конце."""
+    library = Library()
+    book = Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    
+    with library.deferred_index():
+        with library.deferred_index():
+            library.add_book(book)
+        assert len(library.index_dict) == 0
+    
+    assert len(library.index_dict) == 1
+
+
+def test_library_update_index_applies_only_changes():
+    """Тест инкрементального обновления индекса по журналу изменений."""
+    library = Library()
+    book1 = Book("Книга 1", "Автор 1", 2000, "Жанр 1", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор 2", 2010, "Жанр 2", "222-2222222-222-2")
+    library.add_book(book1)
+    index_before = library.index_dict
+    
+    assert len(library.change_log) == 0
+    
+    library.book_collection.add(book2)
+    library.book_collection.remove(book1)
+    assert len(library.change_log) == 2
+    
+    library.update_index()
+    
+    assert library.index_dict is index_before
+    assert len(library.change_log) == 0
+    assert library.search_by_isbn(book1.isbn) is None
+    assert library.search_by_isbn(book2.isbn) == book2
+    assert list(library.search_by_author("Автор 2")) == [book2]
+
+
+def test_library_update_index_full_rebuild_on_overflow():
+    """Тест полного перестроения индекса при переполнении журнала."""
+    library = Library()
+    library.change_log.limit = 2
+    books = [
+        Book(f"Книга {i}", "Автор", 2000, "Жанр", f"111-1111111-111-{i}")
+        for i in range(3)
+    ]
+    index_before = library.index_dict
+    
+    for book in books:
+        library.book_collection.add(book)
+    assert library.change_log.overflowed
+    
+    library.update_index()
+    
+    assert library.index_dict is not index_before
+    assert not library.change_log.overflowed
+    assert len(library.search_by_author("Автор")) == 3
+
+
+def test_change_log_keeps_final_state_per_isbn():
+    """Тест журнала изменений: по каждому ISBN хранится только итоговое состояние."""
+    log = ChangeLog(limit=10)
+    book = Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    
+    log.record(book, True)
+    log.record(book, False)
+    with log.paused():
+        log.record(Book("Другая", "Автор", 2000, "Жанр", "222-2222222-222-2"), True)
+    
+    assert log.entries == {book.isbn: None}
+    assert len(log) == 1
+
+
+def test_library_update_index_applies_store_changes():
+    """Тест применения изменений, сделанных напрямую в BookStore."""
+    book1 = Book("Книга 1", "Автор 1", 2000, "Жанр 1", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор 2", 2010, "Жанр 2", "222-2222222-222-2")
+    library = Library(BookStore([book1]))
+    index_before = library.index_dict
+    
+    library.book_collection.add(book2)
+    library.book_collection.remove(book1)
+    library.update_index()
+    
+    assert library.index_dict is index_before
+    assert library.search_by_isbn(book1.isbn) is None
+    assert library.search_by_isbn(book2.isbn) is book2
+    assert len(library.search_by_genre("Жанр 1")) == 0
+
+
+def test_library_book_mutation_updates_index():
+    """Тест переноса книги в индексе при изменении поля на месте."""
+    library = Library()
+    book = Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    library.add_book(book)
+    index_before = library.index_dict
+    
+    book.author = "Новый автор"
+    book.year = 2010
+    
+    assert library.index_dict is index_before
+    assert len(library.change_log) == 0    
+    assert len(library.search_by_author("Автор")) == 0
+    assert list(library.search_by_author("Новый автор")) == [book]
+    assert list(library.search_by_year(2010)) == [book]
+    assert library.index_dict.sorted_years == [2010]
+
+
+def test_library_book_mutation_deferred():
+    """Тест применения изменений полей из журнала после отложенного индекса."""
+    library = Library()
+    book = Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    library.add_book(book)
+    old_isbn = book.isbn
+    
+    with library.deferred_index():
+        book.isbn = "999-9999999-999-9"
+        book.genre = "Роман"
+        assert library.search_by_isbn(old_isbn) == book
+        assert len(library.change_log) == 1
+    
+    assert library.search_by_isbn(old_isbn) is None
+    assert library.search_by_isbn("999-9999999-999-9") == book
+    assert list(library.search_by_genre("Роман")) == [book]
+
+
+def test_library_removed_book_mutation_ignored():
+    """Тест изменения книги после удаления из библиотеки."""
+    library = Library()
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2000, "Жанр", "222-2222222-222-2")
+    library.add_book(book1)
+    library.add_book(book2)
+    library.remove_book(book1)
+    
+    book1.author = "Другой автор"
+    
+    assert len(library.search_by_author("Другой автор")) == 0
+    assert list(library.search_by_author("Автор")) == [book2]
+
+
+def test_library_owns_books_from_collection():
+    """Тест изменения книг, попавших в библиотеку через коллекцию, а не add_book."""
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2000, "Жанр", "222-2222222-222-2")
+    collection = BookCollection()
+    collection.add(book1)
+    library = Library(collection)
+    
+    library.book_collection.add(book2)
+    book2.author = "Другой автор"
+    library.update_index()
+    book1.year = 2010
+    
+    assert list(library.search_by_author("Другой автор")) == [book2]
+    assert list(library.search_by_year(2010)) == [book1]
+    assert list(library.search_by_author("Автор")) == [book1]
+
+
+def test_library_book_store_mutation():
+    """Тест изменения книги в библиотеке поверх BookStore: колонки и индекс согласованы."""
+    book = Book("Книга", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    library = Library(BookStore())
+    library.add_book(book)
+    
+    book.author = "Другой автор"
+    book.genre = "Роман"
+    book.isbn = "999-9999999-999-9"
+    
+    assert library.book_collection.rows_with_author("Другой автор") == [1]
+    assert list(library.search_by_genre("Роман")) == [book]
+    assert library.search_by_isbn("999-9999999-999-9") is book
+    
+    library.update_index(full=True)
+    
+    assert len(library.search_by_author("Другой автор")) == 1
+    assert len(library.search_by_genre("Роман")) == 1
+    assert library.search_by_isbn("111-1111111-111-1") is None
+
+
+def test_library_search_returns_view_without_copy():
+    """Тест представления результата поиска поверх индекса без копирования."""
+    library = Library()
+    books = [
+        Book(f"Книга {i}", "Автор", 2000 + i % 2, "Жанр", f"111-1111111-111-{i}")
+        for i in range(6)
+    ]
+    library.add_books(books)
+    
+    results = library.search_by_author("Автор")
+    
+    assert len(results) == 6
+    assert results[0] == books[0]
+    assert results[-1] == books[5]
+    assert results[2:4] == books[2:4]
+    assert results[::2] == books[::2]
+    with pytest.raises(IndexError):
+        _ = results[6]
+    
+    library.remove_book(books[0])
+    assert len(results) == 5
+
+
+def test_library_search_view_is_live():
+    """Тест живого представления: удаление в цикле и пересоздание записи по ключу."""
+    library = Library()
+    books = [
+        Book(f"Книга {i}", "Автор", 2000, "Жанр", f"111-1111111-111-{i}")
+        for i in range(3)
+    ]
+    library.add_books(books)
+    results = library.search_by_author("Автор")
+    in_range = library.search_by_year_range(1990, 2010)
+    
+    for book in results:
+        library.remove_book(book)
+    
+    assert len(results) == 0
+    assert len(in_range) == 0
+    
+    library.add_book(books[1])
+    
+    assert list(results) == [books[1]]
+    assert books[1] in results
+    assert in_range[0] == books[1]
+
+
+def test_library_search_view_materialize():
+    """Тест материализации результата в независимую коллекцию."""
+    library = Library()
+    book1 = Book("Книга 1", "Автор", 2000, "Жанр", "111-1111111-111-1")
+    book2 = Book("Книга 2", "Автор", 2001, "Жанр", "222-2222222-222-2")
+    library.add_book(book1)
+    library.add_book(book2)
+    
+    snapshot = library.search_by_year_range(2000, 2001).materialize()
+    library.remove_book(book1)
+    
+    assert isinstance(snapshot, BookCollection)
+    assert list(snapshot) == [book1, book2]
+
+
 def test_library_remove_nonexistent_book():
     """Тест удаления несуществующей книги (должна быть ошибка)."""
     library = Library()
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import json
+
+import pytest
+
+from src.main import main, parse_weight
+
+
+def test_parse_weight():
+    """Тест разбора веса события из командной строки."""
+    assert parse_weight("add_book=2.5") == ("add_book", 2.5)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_weight("fly=1")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_weight("add_book=много")
+
+
+def test_main_headless_json(capsys):
+    """Тест запуска без диалога с итоговой сводкой в JSON."""
+    main(["--steps", "20", "--seed", "3", "--format", "json"])
+    
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["steps"] == 19
+    assert sum(event["count"] for event in summary["events"].values()) == 19
+
+
+def test_main_headless_jsonl(capsys):
+    """Тест запуска без диалога с записью каждого шага в JSON Lines."""
+    main(["--steps", "10", "--seed", "3", "--format", "jsonl", "--weight", "add_book=1"])
+    
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["event"] for line in lines[:-1]] == ["add_book"] * 9
+    assert lines[-1]["summary"]["books"] == 9
+
+
+def test_main_headless_quiet_text(capsys):
+    """Тест тихого текстового режима."""
+    main(["--steps", "10", "--quiet"])
+    
+    output = capsys.readouterr().out
+    assert output.startswith("Шагов: 9")
+    assert "[Шаг" not in output
+
+
+def test_main_rejects_non_positive_steps():
+    """Тест отказа при неположительном количестве шагов."""
+    with pytest.raises(SystemExit):
+        main(["--steps", "0"])
+
+
+def test_main_headless_profile(capsys):
+    """Тест выбора профиля нагрузки из командной строки."""
+    main(["--steps", "30", "--seed", "2", "--profile", "write-heavy", "--format", "json", "--weight", "add_book=1"])
+    
+    summary = json.loads(capsys.readouterr().out)
+    assert list(summary["events"]) == ["add_book"]
+    assert summary["books"] == 1000 + 29
+    with pytest.raises(SystemExit):
+        main(["--profile", "нет-такого"])
+
+
+def test_main_rejects_all_zero_weights(capsys):
+    """Тест отказа, когда ни у одного события нет положительного веса."""
+    with pytest.raises(SystemExit):
+        main(["--steps", "5", "--weight", "add_book=0", "--weight", "search_author=0"])
+    
+    assert "положительного веса" in capsys.readouterr().err
+
+
+def test_main_rejects_profile_events_without_profile(capsys):
+    """Тест отказа от событий профиля без --profile."""
+    with pytest.raises(SystemExit):
+        main(["--steps", "5", "--weight", "search_isbn=1"])
+    
+    assert "--profile" in capsys.readouterr().err
+    main(["--steps", "5", "--seed", "1", "--profile", "read-heavy", "--format", "json", "--weight", "search_isbn=1"])
+    summary = json.loads(capsys.readouterr().out)
+    assert list(summary["events"]) == ["search_isbn"]
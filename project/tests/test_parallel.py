@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.book import IndexDict, Library
+from src.parallel import build_index
+
+
+def snapshot(index):
+    result = {"isbn_index": list(index.isbn_index.items())}
+    for name in ("author_index", "year_index", "title_index", "genre_index"):
+        result[name] = [(key, list(postings)) for key, postings in getattr(index, name).items()]
+    result["sorted_years"] = index.sorted_years
+    for name in ("title_search", "author_search"):
+        search = getattr(index, name)
+        result[name] = (search.sorted_keys, search.originals, search.trigram_index)
+    return result
+
+
+def test_build_index_matches_sequential(make_books):
+    """Тест совпадения параллельного и последовательного построения индекса."""
+    books = make_books(500)
+    sequential = IndexDict()
+    sequential.add_many(books)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = build_index(books, workers=4, chunk_size=37, executor=executor)
+    
+    assert snapshot(parallel) == snapshot(sequential)
+    for author, postings in parallel.author_index.items():
+        assert all(a is b for a, b in zip(postings, sequential.author_index[author]))
+
+
+def test_build_index_with_process_pool(make_books):
+    """Тест построения индекса в пуле процессов."""
+    books = make_books(200)
+    sequential = IndexDict()
+    sequential.add_many(books)
+    
+    parallel = build_index(books, workers=2)
+    
+    assert snapshot(parallel) == snapshot(sequential)
+    assert parallel.isbn_index["isbn-5"] is books[5]
+
+
+def test_build_index_empty():
+    """Тест построения индекса по пустой коллекции."""
+    index = build_index([], workers=2)
+    
+    assert len(index) == 0
+    assert index.sorted_years == []
+
+
+def test_library_update_index_with_workers(make_books):
+    """Тест полного обновления индекса библиотеки в несколько процессов."""
+    library = Library()
+    books = make_books(100)
+    library.add_books(books)
+    expected = snapshot(library.index_dict)
+    
+    library.update_index(full=True, workers=2)
+    
+    assert snapshot(library.index_dict) == expected
+    expected_author = [book for book in books if book.author == "Автор 0"]
+    assert expected_author
+    assert list(library.search_by_author("Автор 0")) == expected_author
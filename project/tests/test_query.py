@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.book import Book, Library
+
+
+def _library() -> tuple[Library, list[Book]]:
+    library = Library()
+    books = [
+        Book("Война и мир", "Лев Толстой", 1869, "Роман", "111-1111111-111-1"),
+        Book("Анна Каренина", "Лев Толстой", 1877, "Роман", "222-2222222-222-2"),
+        Book("Казаки", "Лев Толстой", 1863, "Повесть", "333-3333333-333-3"),
+        Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "444-4444444-444-4"),
+        Book("Война миров", "Герберт Уэллс", 1897, "Фантастика", "555-5555555-555-5"),
+    ]
+    library.add_books(books)
+    return library, books
+
+
+def test_query_single_predicate():
+    """Тест запроса с одним условием."""
+    library, books = _library()
+    
+    assert list(library.query(author="Лев Толстой")) == books[:3]
+
+
+def test_query_intersection():
+    """Тест пересечения нескольких индексов."""
+    library, books = _library()
+    
+    results = library.query(author="Лев Толстой", genre="Роман", year=1869)
+    
+    assert list(results) == [books[0]]
+
+
+def test_query_year_range():
+    """Тест запроса с диапазоном годов."""
+    library, books = _library()
+    
+    results = library.query(author="Лев Толстой", year_range=(1865, 1880))
+    
+    assert list(results) == [books[0], books[1]]
+
+
+def test_query_title_prefix():
+    """Тест условия по префиксу названия."""
+    library, books = _library()
+    
+    assert list(library.query(genre="Роман", title_prefix="война")) == [books[0]]
+    assert list(library.query(title_prefix="Война")) == [books[0], books[4]]
+
+
+def test_query_no_matches():
+    """Тест запроса без совпадений."""
+    library, _ = _library()
+    
+    assert len(library.query(author="Неизвестный автор", genre="Роман")) == 0
+    assert len(library.query(isbn="999-9999999-999-9")) == 0
+
+
+def test_explain_uses_most_selective_index_first():
+    """Тест выбора самого селективного индекса первым."""
+    library, _ = _library()
+    
+    plan = library.explain(genre="Роман", author="Фёдор Достоевский", title_prefix="Война")
+    
+    assert plan.indexes_used == ["author_index", "title_search", "genre_index"]
+    assert plan.estimate == 1
+    assert not plan.full_scan
+    assert "author_index, оценка 1" in plan.explain()
+
+
+def test_explain_full_scan():
+    """Тест плана без условий."""
+    library, books = _library()
+    
+    plan = library.explain()
+    
+    assert plan.indexes_used == []
+    assert plan.full_scan
+    assert "полный просмотр" in plan.explain()
+    assert list(library.query()) == books
+
+
+def test_query_unknown_criterion():
+    """Тест запроса с неизвестным условием (должна быть ошибка)."""
+    library, _ = _library()
+    
+    with pytest.raises(TypeError):
+        library.query(publisher="Эксмо")
@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+
+import pytest
+
+from src.runner import RunResult, aggregate, confidence_interval, main, run_many, run_one
+from src.workload import WorkloadProfile
+
+
+def test_run_one_is_reproducible():
+    """Тест воспроизводимости одного прогона по seed."""
+    first = run_one(5, None, 200)
+    second = run_one(5, None, 200)
+    
+    assert first.profile == "uniform"
+    assert first.steps == 199
+    assert first.books == second.books
+    assert {event: sum(h.values()) for event, h in first.histograms.items()} == \
+        {event: sum(h.values()) for event, h in second.histograms.items()}
+
+
+def test_run_many_in_process_pool():
+    """Тест параллельного прогона пар (seed, профиль)."""
+    profile = WorkloadProfile("writes", {"add_book": 1}, warmup=5)
+    
+    results = run_many(range(3), [None, profile], steps=50, workers=2)
+    
+    assert [(result.seed, result.profile) for result in results] == [
+        (0, "uniform"), (1, "uniform"), (2, "uniform"),
+        (0, "writes"), (1, "writes"), (2, "writes"),
+    ]
+    assert all(result.books == 5 + 49 for result in results[3:])
+
+
+def test_confidence_interval():
+    """Тест доверительного интервала для среднего."""
+    low, high = confidence_interval([10.0, 12.0, 14.0])
+    
+    assert low < 12.0 < high
+    assert high - 12.0 == pytest.approx(1.96 * 2.0 / 3 ** 0.5)
+    assert confidence_interval([7.0]) == (7.0, 7.0)
+
+
+def test_aggregate_merges_histograms():
+    """Тест сводки прогонов по профилям."""
+    results = [
+        RunResult(0, "a", 100, 10, 1.0, 0, {"add_book": {40: 3}}),
+        RunResult(1, "a", 100, 20, 2.0, 1, {"add_book": {40: 1, 60: 1}}),
+        RunResult(0, "b", 10, 1, 1.0, 0, {}),
+    ]
+    
+    report = aggregate(results)
+    
+    assert set(report) == {"a", "b"}
+    assert report["a"]["runs"] == 2
+    assert report["a"]["errors"] == 1
+    assert report["a"]["ops_per_second"]["mean"] == 75.0
+    assert report["a"]["books"]["min"] == 10
+    add_book = report["a"]["events"]["add_book"]
+    assert add_book["count"] == 5
+    assert add_book["p50_us"] < add_book["p99_us"]
+
+
+def test_main_writes_report(tmp_path, capsys):
+    """Тест запуска из командной строки с записью отчёта."""
+    output = tmp_path / "runs.json"
+    
+    assert main(["--seeds", "2", "--steps", "30", "--workers", "1", "--output", str(output)]) == 0
+    
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert data["summary"]["uniform"]["runs"] == 2
+    assert len(data["runs"]) == 2
+    assert capsys.readouterr().out.startswith("uniform: 2 прогонов")
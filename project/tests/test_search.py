@@ -0,0 +1,151 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.book import Book, Library
+from src.search import TextIndex, edit_distance, normalize
+
+
+def test_normalize():
+    """Тест нормализации регистра, ё/е, пробелов и Unicode-форм."""
+    assert normalize("Мёртвые  Души") == "мертвые души"
+    assert normalize("Ёж") == "еж"
+    assert normalize("ＡＢＣ") == "abc"
+
+
+def test_text_index_prefix():
+    """Тест поиска ключей по префиксу."""
+    index = TextIndex()
+    for key in ("Мастер и Маргарита", "Мать", "Мёртвые души", "Идиот"):
+        index.add(key)
+    
+    assert list(index.prefix("ма")) == ["Мастер и Маргарита", "Мать"]
+    assert list(index.prefix("мерт")) == ["Мёртвые души"]
+    assert list(index.prefix("Я")) == []
+
+
+def test_text_index_contains():
+    """Тест поиска ключей по подстроке."""
+    index = TextIndex()
+    for key in ("Мастер и Маргарита", "Маргарита", "Идиот"):
+        index.add(key)
+    
+    assert sorted(index.contains("маргар")) == ["Маргарита", "Мастер и Маргарита"]
+    assert list(index.contains("ди")) == ["Идиот"]
+    assert list(index.contains("Толстой")) == []
+
+
+def test_text_index_remove():
+    """Тест удаления ключа из префиксного и триграммного индексов."""
+    index = TextIndex()
+    index.add("Идиот")
+    index.add("идиот")
+    
+    index.remove("Идиот")
+    assert list(index.prefix("ид")) == ["идиот"]
+    
+    index.remove("идиот")
+    assert len(index) == 0
+    assert index.trigram_index == {}
+
+
+def test_text_index_add_many():
+    """Тест пакетного добавления ключей."""
+    index = TextIndex()
+    index.add("Обломов")
+    index.add_many(["Идиот", "Анна Каренина", "Обломов"])
+    
+    assert index.sorted_keys == ["анна каренина", "идиот", "обломов"]
+
+
+def test_text_index_add_prepared():
+    """Тест присоединения ключей, разобранных заранее через prepare."""
+    keys = ["Идиот", "Анна Каренина", "ИДИОТ"]
+    expected = TextIndex()
+    expected.add("Обломов")
+    expected.add_many(keys)
+    index = TextIndex()
+    index.add("Обломов")
+    
+    index.add_prepared(TextIndex.prepare(keys))
+    
+    assert index.sorted_keys == expected.sorted_keys
+    assert index.originals == expected.originals
+    assert index.trigram_index == expected.trigram_index
+
+
+def test_library_search_by_title_prefix():
+    """Тест поиска книг по префиксу названия."""
+    library = Library()
+    book1 = Book("Мастер и Маргарита", "Михаил Булгаков", 1967, "Роман", "111-1111111-111-1")
+    book2 = Book("Мать", "Максим Горький", 1906, "Роман", "222-2222222-222-2")
+    book3 = Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "333-3333333-333-3")
+    library.add_books([book1, book2, book3])
+    
+    assert list(library.search_by_title_prefix("МА")) == [book1, book2]
+    
+    library.remove_book(book2)
+    assert list(library.search_by_title_prefix("ма")) == [book1]
+
+
+def test_library_search_by_title_contains():
+    """Тест поиска книг по подстроке названия с учётом переименования."""
+    library = Library()
+    book1 = Book("Мастер и Маргарита", "Михаил Булгаков", 1967, "Роман", "111-1111111-111-1")
+    book2 = Book("Мёртвые души", "Николай Гоголь", 1842, "Поэма", "222-2222222-222-2")
+    library.add_book(book1)
+    library.add_book(book2)
+    
+    assert list(library.search_by_title_contains("маргарит")) == [book1]
+    assert list(library.search_by_title_contains("мертв")) == [book2]
+    
+    book2.title = "Ревизор"
+    assert len(library.search_by_title_contains("мертв")) == 0
+    assert list(library.search_by_title_contains("визор")) == [book2]
+
+
+def test_edit_distance():
+    """Тест ограниченного расстояния Левенштейна."""
+    assert edit_distance("идиот", "идиот", 2) == 0
+    assert edit_distance("идиот", "идиоты", 2) == 1
+    assert edit_distance("кот", "ток", 2) == 2
+    assert edit_distance("война и мир", "идиот", 2) == 3
+
+
+def test_text_index_fuzzy():
+    """Тест приближённого поиска с ё/е, опечатками и перестановкой слов."""
+    index = TextIndex()
+    for key in ("Фёдор Достоевский", "Лев Толстой", "Алексей Толстой", "Антон Чехов"):
+        index.add(key)
+    
+    assert index.fuzzy("Федор Достоевский") == [("Фёдор Достоевский", 0)]
+    assert index.fuzzy("Достоевский Фёдор") == [("Фёдор Достоевский", 0)]
+    assert index.fuzzy("Лев Толстый") == [("Лев Толстой", 1)]
+    assert index.fuzzy("Антон Чехов", max_distance=0) == [("Антон Чехов", 0)]
+    assert index.fuzzy("Михаил Булгаков") == []
+
+
+def test_text_index_fuzzy_limit_and_budget():
+    """Тест ограничения числа кандидатов и бюджета времени."""
+    index = TextIndex()
+    for i in range(10):
+        index.add(f"Автор {i}")
+    
+    assert len(index.fuzzy("Автор 1", limit=3)) == 3
+    assert index.fuzzy("Автор 1", time_budget=0) == []
+
+
+def test_library_match_authors():
+    """Тест приближённого поиска автора в библиотеке."""
+    library = Library()
+    book = Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "111-1111111-111-1")
+    library.add_book(book)
+    
+    matches = library.match_authors("Достоевский Федор")
+    
+    assert matches == [("Фёдор Достоевский", 0)]
+    assert list(library.search_by_author(matches[0][0])) == [book]
+    assert library.match_titles("Идеот") == [("Идиот", 1)]
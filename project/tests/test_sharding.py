@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.book import Library
+from src.sharding import ShardedLibrary, shard_of
+
+
+def isbns(books):
+    return sorted(book.isbn for book in books)
+
+
+def test_shard_of_is_stable():
+    """Тест стабильного распределения ISBN по шардам."""
+    assert shard_of("111-1111111-111-1", 4) == shard_of("111-1111111-111-1", 4)
+    assert {shard_of(f"isbn-{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_sharded_library_matches_library(make_books):
+    """Тест совпадения результатов шардированной и обычной библиотеки."""
+    books = make_books(60)
+    library = Library()
+    library.add_books(books)
+    
+    with ShardedLibrary(shards=3) as sharded:
+        sharded.add_books(books[:50])
+        for book in books[50:]:
+            sharded.add_book(book)
+        
+        assert len(sharded) == 60
+        assert sharded.search_by_isbn("isbn-7").title == "Книга 7"
+        assert sharded.search_by_isbn("нет") is None
+        for author in ("Автор 0", "Автор 1", "Автор 2"):
+            assert isbns(sharded.search_by_author(author)) == isbns(library.search_by_author(author))
+        assert isbns(sharded.search_by_year(2001)) == isbns(library.search_by_year(2001))
+        assert isbns(sharded.search_by_genre("Жанр 0")) == isbns(library.search_by_genre("Жанр 0"))
+        assert isbns(sharded.search_by_title("Книга 3")) == ["isbn-3"]
+
+
+def test_sharded_library_remove_and_update_index(make_books):
+    """Тест удаления и параллельного обновления индексов шардов."""
+    books = make_books(20)
+    
+    with ShardedLibrary(shards=2) as sharded:
+        sharded.add_books(books)
+        sharded.remove_book(books[4])
+        sharded.update_index(full=True)
+        
+        assert len(sharded) == 19
+        assert sharded.search_by_isbn("isbn-4") is None
+        assert "isbn-4" not in isbns(sharded.search_by_author("Автор 1"))
+        with pytest.raises(ValueError):
+            sharded.remove_book(books[4])
+
+
+def test_sharded_library_shards_lock_independently(make_books):
+    """Тест независимых блокировок: занятый шард не задерживает вызовы других шардов."""
+    books = make_books(20)
+    
+    with ShardedLibrary(shards=2) as sharded:
+        sharded.add_books(books)
+        busy = shard_of("isbn-0", 2)
+        other = next(book for book in books if shard_of(book.isbn, 2) != busy)
+        
+        with sharded._locks[busy]:
+            assert sharded.search_by_isbn(other.isbn).title == other.title
+        assert sharded.search_by_isbn("isbn-0").title == "Книга 0"
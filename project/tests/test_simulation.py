@@ -8,14 +8,20 @@ sys.path.insert(0, str(project_root))
 import random
 import pytest
 from src.book import Library, Book
+from src.store import BookStore
 from src.simulation import (
     run_simulation,
+    histogram_bucket,
+    histogram_percentile,
     generate_random_isbn,
     generate_random_author,
     generate_random_genre,
     generate_random_title,
     generate_random_year,
     create_random_book,
+    create_random_books,
+    AUTHORS,
+    TITLES,
     event_add_book,
     event_remove_random_book,
     event_search_by_author,
@@ -72,6 +78,17 @@ def test_create_random_book():
     assert isinstance(book.isbn, str)
 
 
+def test_create_random_book_field_order():
+    """Тест порядка полей случайной книги: название, автор, год, жанр, ISBN."""
+    book = create_random_book()
+    
+    assert book.title in TITLES
+    assert book.author in AUTHORS
+    assert isinstance(book.year, int)
+    assert book.genre in ("Исторический роман", "Детектив", "Фантастика")
+    assert len(book.isbn.split("-")) == 4
+
+
 def test_event_add_book():
     """Тест события добавления книги."""
     library = Library()
@@ -253,3 +270,97 @@ def test_simulation_events_diversity():
     
     assert len(events_called) >= 5
 
+
+
+def test_event_emit_collects_messages():
+    """Тест передачи сообщений события через emit."""
+    library = Library()
+    messages = []
+    
+    event_add_book(library, messages.append)
+    event_update_index(library, messages.append)
+    event_search_nonexistent_book(library, None)
+    
+    assert len(messages) == 2
+    assert messages[0].startswith("Добавлена книга")
+    assert messages[1] == "Индекс обновлен. Всего книг в индексе: 1"
+
+
+def test_run_simulation_quiet(capsys):
+    """Тест тихого режима симуляции со счётчиками событий."""
+    trace = []
+    
+    stats = run_simulation(steps=50, seed=7, quiet=True, trace=trace)
+    
+    assert capsys.readouterr().out == ""
+    assert stats.steps == 49
+    assert sum(stats.counts.values()) == 49
+    assert len(trace) == 49
+    assert set(stats.nanoseconds) == set(stats.counts)
+    assert {name: sum(histogram.values()) for name, histogram in stats.histograms.items()} == stats.counts
+    summary = stats.summary()
+    assert summary["books"] == stats.books
+    assert summary["events"].keys() == stats.counts.keys()
+
+
+def test_run_simulation_weights():
+    """Тест выбора событий по весам."""
+    stats = run_simulation(steps=30, seed=1, quiet=True, weights={"add_book": 1, "search_author": 0})
+    
+    assert stats.counts == {"add_book": 29}
+    assert stats.books == 29
+    with pytest.raises(ValueError):
+        run_simulation(steps=5, quiet=True, weights={"fly": 1})
+
+
+def test_create_random_books_reproducible():
+    """Тест воспроизводимости пакетного создания книг."""
+    first = list(create_random_books(500, seed=3, chunk_size=128))
+    second = list(create_random_books(500, seed=3, chunk_size=128))
+    other = list(create_random_books(500, seed=4, chunk_size=128))
+    
+    fields = lambda book: (book.title, book.author, book.year, book.genre, book.isbn)
+    assert len(first) == 500
+    assert list(map(fields, first)) == list(map(fields, second))
+    assert list(map(fields, first)) != list(map(fields, other))
+    assert len({book.isbn for book in first}) == 500
+
+
+def test_create_random_books_fields():
+    """Тест значений полей пакетно созданных книг."""
+    books = list(create_random_books(300, seed=1))
+    
+    for book in books:
+        assert isinstance(book.title, str)
+        assert isinstance(book.author, str)
+        assert isinstance(book.year, int)
+        assert 0 <= book.year <= 2024 and book.year % 100 != 0
+        assert book.genre in ("Исторический роман", "Детектив", "Фантастика")
+        head, middle, tail, check = book.isbn.split("-")
+        assert (len(head), len(middle), len(tail), len(check)) == (3, 7, 3, 1)
+
+
+def test_create_random_books_columnar():
+    """Тест пакетного создания книг сразу в колоночное хранилище."""
+    store = create_random_books(1000, seed=9, columnar=True, chunk_size=300)
+    books = list(create_random_books(1000, seed=9, chunk_size=300))
+    
+    # simulation.py импортирует модули как project.src.*, поэтому классы сравниваются по имени.
+    assert type(store).__name__ == BookStore.__name__
+    assert len(store) == 1000
+    assert [book.isbn for book in store] == [book.isbn for book in books]
+    assert [book.year for book in store] == [book.year for book in books]
+    library = Library(store)
+    assert library.search_by_isbn(books[10].isbn).title == books[10].title
+
+
+def test_histogram_percentile():
+    """Тест процентилей по гистограмме задержек."""
+    histogram = {}
+    for nanoseconds in [1000] * 90 + [100_000] * 10:
+        bucket = histogram_bucket(nanoseconds)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    
+    assert histogram_percentile(histogram, 50) == pytest.approx(1000, rel=0.1)
+    assert histogram_percentile(histogram, 99) == pytest.approx(100_000, rel=0.1)
+    assert histogram_percentile({}, 50) == 0.0
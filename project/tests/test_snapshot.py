@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.book import Library
+from src.snapshot import Snapshot, write_snapshot
+
+
+def test_snapshot_roundtrip(tmp_path, books, fields):
+    """Тест сохранения и загрузки библиотеки через снимок."""
+    library = Library()
+    library.add_books(books)
+    path = tmp_path / "library.snap"
+    
+    library.save(path)
+    loaded = Library.load(path)
+    
+    assert [fields(book) for book in loaded.book_collection] == [fields(book) for book in books]
+    assert len(loaded.index_dict) == 4
+    assert len(loaded.search_by_author("Лев Толстой")) == 2
+
+
+def test_snapshot_load_keeps_postings_and_ownership(tmp_path, make_books):
+    """Тест индекса, собранного из снимка: тот же порядок книг, правки обновляют индекс."""
+    library = Library()
+    library.add_books(make_books(12))
+    path = tmp_path / "library.snap"
+    library.save(path)
+    
+    loaded = Library.load(path)
+    
+    for author in ("Автор 0", "Автор 1", "Автор 2"):
+        assert [book.isbn for book in loaded.search_by_author(author)] == [
+            book.isbn for book in library.search_by_author(author)
+        ]
+    assert [book.isbn for book in loaded.search_by_year_range(2001, 2002)] == [
+        book.isbn for book in library.search_by_year_range(2001, 2002)
+    ]
+    book = loaded.search_by_isbn("isbn-4")
+    book.author = "Автор 9"
+    assert [found.isbn for found in loaded.search_by_author("Автор 9")] == ["isbn-4"]
+    assert book not in loaded.search_by_author("Автор 1")
+
+
+def test_snapshot_lookups_without_loading(tmp_path, books):
+    """Тест поиска напрямую по отображённому в память снимку."""
+    path = tmp_path / "library.snap"
+    write_snapshot(books, path)
+    
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 4
+        assert snapshot.search_by_isbn("978-0000000-000-1").title == "Идиот"
+        assert snapshot.search_by_isbn("978-0000000-000-9") is None
+        assert [book.title for book in snapshot.search_by_author("Лев Толстой")] == [
+            "Война и мир",
+            "Анна Каренина",
+        ]
+        assert [book.title for book in snapshot.search_by_year(1869)] == ["Война и мир", "Идиот"]
+        assert [book.title for book in snapshot.search_by_genre("Повесть")] == ["Нос, повесть"]
+        assert [book.author for book in snapshot.search_by_title("Идиот")] == ["Фёдор Достоевский"]
+        assert snapshot.search_by_author("Антон Чехов") == []
+        assert snapshot.search_by_year(1900) == []
+
+
+def test_snapshot_empty_library(tmp_path):
+    """Тест снимка пустой библиотеки."""
+    path = tmp_path / "empty.snap"
+    Library().save(path)
+    
+    with Snapshot(path) as snapshot:
+        assert len(snapshot) == 0
+        assert list(snapshot) == []
+        assert snapshot.search_by_isbn("978-0000000-000-1") is None
+        assert snapshot.search_by_author("Лев Толстой") == []
+
+
+def test_snapshot_invalid_file(tmp_path):
+    """Тест открытия файла, не являющегося снимком (должна быть ошибка)."""
+    path = tmp_path / "broken.snap"
+    path.write_bytes(b"not a snapshot" * 10)
+    
+    with pytest.raises(ValueError):
+        Snapshot(path)
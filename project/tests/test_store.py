@@ -0,0 +1,202 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.book import Book, Library
+from src.store import BookStore, StringTable
+
+
+def test_book_store_creation():
+    """Тест создания пустого хранилища."""
+    store = BookStore()
+    assert len(store) == 0
+    assert list(store) == []
+
+
+def test_book_store_add_and_read(books, fields):
+    """Тест добавления книг и ленивого чтения по индексу."""
+    store = BookStore(books)
+    
+    assert len(store) == 4
+    assert fields(store[0]) == fields(books[0])
+    assert fields(store[-1]) == fields(books[3])
+    assert [fields(book) for book in store[1:3]] == [fields(book) for book in books[1:3]]
+    assert [fields(book) for book in store] == [fields(book) for book in books]
+
+
+def test_book_store_dictionary_encoding(books):
+    """Тест словарного кодирования повторяющихся строк."""
+    store = BookStore(books)
+    
+    assert len(store.authors) == 3
+    assert len(store.genres) == 2
+    assert list(store.author_codes) == [0, 1, 2, 0]
+
+
+def test_string_table_encode_many():
+    """Тест пакетного кодирования строк теми же кодами, что и по одной."""
+    table = StringTable()
+    table.encode("Роман")
+    
+    assert list(table.encode_many(["Повесть", "Роман", "Повесть", "Пьеса"])) == [1, 0, 1, 2]
+    assert table.values == ["Роман", "Повесть", "Пьеса"]
+
+
+def test_book_store_remove(books):
+    """Тест удаления книги по ISBN с сохранением порядка."""
+    store = BookStore(books)
+    
+    store.remove(books[1])
+    
+    assert len(store) == 3
+    assert books[1] not in store
+    assert [book.isbn for book in store] == [books[0].isbn, books[2].isbn, books[3].isbn]
+    assert store[1].isbn == books[2].isbn
+
+
+def test_book_store_remove_many_compacts(books, fields):
+    """Тест уплотнения колонок после массового удаления."""
+    store = BookStore(books)
+    
+    for book in books[:3]:
+        store.remove(book)
+    
+    assert len(store.years) == 1
+    assert fields(store[0]) == fields(books[3])
+
+
+def test_book_store_random_book(books):
+    """Тест случайного выбора книги, пропускающего удалённые строки."""
+    store = BookStore(books)
+    
+    store.remove(books[0])
+    picked = {store.random_book().isbn for _ in range(100)}
+    
+    assert picked == {book.isbn for book in books[1:]}
+    assert len(store.years) == 4
+    with pytest.raises(IndexError):
+        BookStore().random_book()
+
+
+def test_book_store_remove_nonexistent():
+    """Тест удаления несуществующей книги (должна быть ошибка)."""
+    store = BookStore()
+    book = Book("Тест", "Автор", 2000, "Жанр", "123-4567890-123-4")
+    
+    with pytest.raises(ValueError):
+        store.remove(book)
+
+
+def test_book_store_add_duplicate_isbn(books):
+    """Тест добавления книги с уже существующим ISBN (должна быть ошибка)."""
+    store = BookStore(books)
+    
+    with pytest.raises(ValueError):
+        store.add(books[0])
+
+
+def test_book_store_extend_columns(books, fields):
+    """Тест добавления книг колонками."""
+    store = BookStore(books[:1])
+    columns = [list(column) for column in zip(*map(fields, books[1:]))]
+    
+    store.extend_columns(*columns)
+    
+    assert [fields(book) for book in store] == [fields(book) for book in books]
+    assert store.rows_with_author("Лев Толстой") == [0, 3]
+    store.remove(books[2])
+    assert len(store) == 3
+    with pytest.raises(ValueError):
+        store.extend_columns(["Нос"], ["Гоголь"], [1836], ["Повесть"], [books[0].isbn])
+    with pytest.raises(ValueError):
+        store.extend_columns(["А", "Б"], ["Автор", "Автор"], [1, 2], ["Жанр", "Жанр"], ["x", "x"])
+    assert len(store) == 3
+
+
+def test_book_store_index_out_of_range():
+    """Тест обращения к несуществующему индексу."""
+    store = BookStore()
+    
+    with pytest.raises(IndexError):
+        _ = store[0]
+
+
+def test_book_store_column_filters(books):
+    """Тест фильтров по колонкам жанра, автора и года."""
+    store = BookStore(books)
+    store.remove(books[0])
+    
+    assert store.rows_with_genre("Роман") == [1, 3]
+    assert store.rows_with_genre("Детектив") == []
+    assert store.rows_with_author("Лев Толстой") == [3]
+    assert store.rows_in_year_range(1860, 1870) == [1]
+    assert [book.title for book in store.books_at(store.rows_in_year_range(1800, 1900))] == [
+        "Идиот",
+        "Нос, повесть",
+        "Анна Каренина",
+    ]
+
+
+def test_library_with_book_store_backend(books):
+    """Тест работы библиотеки поверх колоночного хранилища."""
+    library = Library(BookStore())
+    for book in books:
+        library.add_book(book)
+    
+    assert len(library.search_by_author("Лев Толстой")) == 2
+    assert len(library.search_by_genre("Роман")) == 3
+    
+    library.remove_book(library.book_collection[0])
+    
+    assert len(library.book_collection) == 3
+    assert len(library.index_dict) == 3
+    assert len(library.search_by_author("Лев Толстой")) == 1
+    assert len(library.search_by_genre("Роман")) == 2
+    assert len(library.search_by_year(1869)) == 1
+    assert library.search_by_isbn(books[0].isbn) is None
+
+
+def test_library_built_from_existing_store(books):
+    """Тест построения индекса для уже заполненного хранилища."""
+    library = Library(BookStore(books))
+    
+    assert len(library.index_dict) == 4
+    assert len(library.search_by_genre("Роман")) == 3
+
+
+def test_library_book_store_postings(books):
+    """Тест поиска по году и жанру в индексе библиотеки поверх хранилища."""
+    library = Library(BookStore())
+    library.add_books(books)
+    
+    assert list(library.search_by_genre("Роман")) == [books[0], books[1], books[3]]
+    assert list(library.search_by_year(1869)) == [books[0], books[1]]
+    assert list(library.search_by_year_range(1830, 1870)) == [books[2], books[0], books[1]]
+    assert len(library.search_by_year_range(1830, 1870)) == 3
+    assert library.search_newest(2)[:] == [books[3], books[1]]
+    assert list(library.query(genre="Роман", year_range=(1870, 1880))) == [books[3]]
+    
+    library.remove_book(library.search_by_isbn(books[0].isbn))
+    
+    assert list(library.search_by_genre("Роман")) == [books[1], books[3]]
+    assert len(library.index_dict.genre_index["Роман"]) == 2
+    assert books[1] in library.search_by_year(1869)
+    assert books[0] not in library.search_by_year(1869)
+
+
+def test_library_book_store_iteration_yields_owned_books(books):
+    """Тест правки книг при обходе хранилища библиотеки: изменения доходят до индекса."""
+    library = Library(BookStore())
+    library.add_books(books)
+    
+    for book in library.book_collection:
+        book.author = "Б"
+    
+    assert len(library.search_by_author("Б")) == 4
+    assert len(library.search_by_author("Лев Толстой")) == 0
+    assert library.book_collection[0] is library.search_by_isbn(books[0].isbn)
+    assert {book.author for book in BookStore(library.book_collection)} == {"Б"}
@@ -0,0 +1,179 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import time
+
+import pytest
+from src.book import Book, Library
+from src.wal import ADD, REMOVE, WriteAheadLog, compact, recover, replay
+
+
+def test_wal_replay_records(tmp_path, fields):
+    """Тест записи и чтения операций журнала."""
+    path = tmp_path / "library.wal"
+    book = Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "111-1111111-111-1")
+    
+    with WriteAheadLog(path) as wal:
+        wal.log_add(book)
+        wal.log_remove(book.isbn)
+    
+    records = list(replay(path))
+    assert [operation for operation, _ in records] == [ADD, REMOVE]
+    assert fields(records[0][1]) == fields(book)
+    assert records[1][1] == book.isbn
+
+
+def test_wal_group_commit(tmp_path):
+    """Тест группового сброса записей на диск."""
+    path = tmp_path / "library.wal"
+    wal = WriteAheadLog(path, sync="batch", batch_size=3)
+    
+    wal.log_remove("111-1111111-111-1")
+    wal.log_remove("222-2222222-222-2")
+    assert list(replay(path)) == []
+    
+    wal.log_remove("333-3333333-333-3")
+    assert len(list(replay(path))) == 3
+    wal.close()
+
+
+def test_wal_group_commit_time_bound(tmp_path):
+    """Тест сброса неполной группы по истечении max_delay."""
+    path = tmp_path / "library.wal"
+    wal = WriteAheadLog(path, sync="batch", batch_size=100, max_delay=0.05)
+    
+    wal.log_remove("111-1111111-111-1")
+    assert list(replay(path)) == []
+    
+    deadline = time.monotonic() + 5
+    while not list(replay(path)) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(list(replay(path))) == 1
+    wal.close()
+
+
+def test_wal_sync_always(tmp_path):
+    """Тест немедленного сброса каждой записи."""
+    path = tmp_path / "library.wal"
+    wal = WriteAheadLog(path, sync="always", batch_size=100)
+    
+    wal.log_remove("111-1111111-111-1")
+    
+    assert len(list(replay(path))) == 1
+    wal.close()
+
+
+def test_wal_unknown_sync_policy(tmp_path):
+    """Тест неизвестной политики синхронизации (должна быть ошибка)."""
+    with pytest.raises(ValueError):
+        WriteAheadLog(tmp_path / "library.wal", sync="sometimes")
+
+
+def test_wal_torn_tail_ignored(tmp_path):
+    """Тест отбрасывания недописанной записи в конце журнала."""
+    path = tmp_path / "library.wal"
+    with WriteAheadLog(path) as wal:
+        wal.log_remove("111-1111111-111-1")
+        wal.log_remove("222-2222222-222-2")
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    
+    records = replay(path)
+    assert [isbn for _, isbn in records] == ["111-1111111-111-1"]
+    assert records.offset == len(data) // 2
+
+
+def test_library_recover_appends_after_torn_tail(tmp_path):
+    """Тест записи в журнал после восстановления с недописанным хвостом."""
+    snapshot_path = tmp_path / "library.snap"
+    wal_path = tmp_path / "library.wal"
+    book1 = Book("Война и мир", "Лев Толстой", 1869, "Роман", "111-1111111-111-1")
+    book2 = Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "222-2222222-222-2")
+    book3 = Book("Нос", "Николай Гоголь", 1836, "Повесть", "333-3333333-333-3")
+    with WriteAheadLog(wal_path) as wal:
+        wal.log_add(book1)
+        wal.log_add(book2)
+    data = wal_path.read_bytes()
+    wal_path.write_bytes(data[:-3])
+    
+    library = recover(snapshot_path, wal_path)
+    library.add_book(book3)
+    library.wal.close()
+    
+    recovered = recover(snapshot_path, wal_path)
+    assert [book.isbn for book in recovered.book_collection] == [book1.isbn, book3.isbn]
+    recovered.wal.close()
+
+
+def test_library_recover_from_snapshot_and_wal(tmp_path, fields):
+    """Тест восстановления библиотеки из снимка и журнала."""
+    snapshot_path = tmp_path / "library.snap"
+    wal_path = tmp_path / "library.wal"
+    book1 = Book("Война и мир", "Лев Толстой", 1869, "Роман", "111-1111111-111-1")
+    book2 = Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "222-2222222-222-2")
+    book3 = Book("Нос", "Николай Гоголь", 1836, "Повесть", "333-3333333-333-3")
+    
+    library = recover(snapshot_path, wal_path)
+    library.add_book(book1)
+    library.add_book(book2)
+    compact(library, snapshot_path)
+    library.add_book(book3)
+    library.remove_book(book1)
+    book2.year = 1868
+    library.wal.close()
+    
+    assert wal_path.stat().st_size > 0
+    restored = recover(snapshot_path, wal_path)
+    
+    assert sorted(fields(book) for book in restored.book_collection) == sorted(
+        fields(book) for book in (book2, book3)
+    )
+    assert restored.search_by_isbn(book1.isbn) is None
+    assert len(restored.search_by_year(1868)) == 1
+    restored.wal.close()
+
+
+def test_library_recover_does_not_relog_replayed_records(tmp_path):
+    """Тест применения журнала без повторной записи и с владением книгами."""
+    snapshot_path = tmp_path / "library.snap"
+    wal_path = tmp_path / "library.wal"
+    book1 = Book("Война и мир", "Лев Толстой", 1869, "Роман", "111-1111111-111-1")
+    book2 = Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "222-2222222-222-2")
+    library = Library()
+    library.add_book(book1)
+    library.save(snapshot_path)
+    with WriteAheadLog(wal_path) as wal:
+        wal.log_add(Book("Война и мир", "Лев Толстой", 1867, "Роман", book1.isbn))
+        wal.log_add(book2)
+    size = wal_path.stat().st_size
+    
+    restored = recover(snapshot_path, wal_path)
+    restored.wal.flush()
+    
+    assert wal_path.stat().st_size == size
+    assert len(restored.book_collection) == 2
+    assert restored.search_by_isbn(book1.isbn).year == 1867
+    restored.search_by_isbn(book2.isbn).year = 1868
+    assert len(restored.search_by_year(1868)) == 1
+    restored.wal.close()
+
+
+def test_library_compact_truncates_wal(tmp_path):
+    """Тест очистки журнала после сворачивания в снимок."""
+    snapshot_path = tmp_path / "library.snap"
+    wal_path = tmp_path / "library.wal"
+    library = Library()
+    library.wal = WriteAheadLog(wal_path)
+    library.add_book(Book("Идиот", "Фёдор Достоевский", 1869, "Роман", "111-1111111-111-1"))
+    
+    compact(library, snapshot_path)
+    
+    assert wal_path.stat().st_size == 0
+    library.wal.close()
+    restored = recover(snapshot_path, wal_path)
+    assert len(restored.book_collection) == 1
+    restored.wal.close()
@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в путь для импортов
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from src.book import Book, Library
+from src.simulation import run_simulation
+from src.workload import PRESETS, WorkloadProfile, get_profile, load_profile, zipf_index
+
+
+def test_zipf_index_uniform_and_skewed():
+    """Тест выбора позиций по закону Ципфа."""
+    rng = random.Random(1)
+    uniform = Counter(zipf_index(10, 0, rng) for _ in range(5000))
+    skewed = Counter(zipf_index(10, 1.2, rng) for _ in range(5000))
+    
+    assert set(uniform) == set(range(10))
+    assert all(0 <= index < 10 for index in skewed)
+    assert skewed[0] > skewed[1] > skewed[5]
+    assert skewed[0] > 5000 / 10 * 2
+    assert zipf_index(1, 2.0, rng) == 0
+
+
+def test_profile_validation():
+    """Тест проверки профиля нагрузки."""
+    with pytest.raises(ValueError):
+        WorkloadProfile("bad", {"fly": 1})
+    with pytest.raises(ValueError):
+        WorkloadProfile("bad", {"add_book": 1}, isbn_hit_ratio=1.5)
+    with pytest.raises(ValueError):
+        WorkloadProfile("bad", {"add_book": 1}, warmup=-1)
+
+
+def test_event_search_by_isbn_hit_ratio():
+    """Тест доли найденных книг при поиске по ISBN."""
+    library = Library()
+    for i in range(20):
+        library.add_book(Book(f"Книга {i}", "Автор", 2000, "Жанр", f"isbn-{i}"))
+    messages = []
+    
+    WorkloadProfile("hit", {"search_isbn": 1}, isbn_hit_ratio=1.0).event_search_by_isbn(library, messages.append)
+    WorkloadProfile("miss", {"search_isbn": 1}).event_search_by_isbn(library, messages.append)
+    
+    assert messages[0].endswith("найдена") and "не найдена" not in messages[0]
+    assert messages[1].endswith("не найдена")
+
+
+def test_event_search_by_isbn_skips_removed_books():
+    """Тест поиска по ISBN после удалений: выбираются только книги коллекции."""
+    library = Library()
+    books = [Book(f"Книга {i}", "Автор", 2000, "Жанр", f"isbn-{i}") for i in range(20)]
+    library.add_books(books)
+    for book in books[:8]:
+        library.remove_book(book)
+    messages = []
+    profile = WorkloadProfile("hit", {"search_isbn": 1}, isbn_skew=1.2, isbn_hit_ratio=1.0)
+    
+    for _ in range(50):
+        profile.event_search_by_isbn(library, messages.append)
+    
+    assert all("не найдена" not in message for message in messages)
+
+
+def test_run_simulation_with_profile():
+    """Тест симуляции с профилем нагрузки и начальным каталогом."""
+    profile = WorkloadProfile("test", {"search_isbn": 9, "add_book": 1}, isbn_hit_ratio=0.8, warmup=30)
+    
+    stats = run_simulation(steps=101, seed=5, quiet=True, profile=profile)
+    
+    assert set(stats.counts) <= {"search_isbn", "add_book"}
+    assert stats.counts["search_isbn"] > stats.counts.get("add_book", 0)
+    assert stats.books == 30 + stats.counts.get("add_book", 0)
+
+
+def test_presets_run():
+    """Тест встроенных профилей нагрузки."""
+    assert set(PRESETS) == {"read-heavy", "write-heavy", "reindex-storm"}
+    for name, preset in PRESETS.items():
+        small = WorkloadProfile(name, preset.weights, preset.author_skew, preset.isbn_skew, preset.isbn_hit_ratio, 20)
+        stats = run_simulation(steps=30, seed=1, quiet=True, profile=small)
+        assert set(stats.counts) <= set(preset.weights)
+
+
+def test_load_profile_from_file(tmp_path):
+    """Тест загрузки профиля из JSON-файла."""
+    path = tmp_path / "mostly-reads.json"
+    path.write_text(json.dumps({"weights": {"search_isbn": 95, "add_book": 5}, "isbn_hit_ratio": 0.7}), encoding="utf-8")
+    
+    profile = load_profile(path)
+    
+    assert profile.name == "mostly-reads"
+    assert profile.isbn_hit_ratio == 0.7
+    assert get_profile(str(path)) == profile
+    assert get_profile("read-heavy") is PRESETS["read-heavy"]
+    with pytest.raises(ValueError):
+        get_profile("нет-такого")
+    path.write_text(json.dumps({"weights": {"add_book": 1}, "speed": 3}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_profile(path)